@@ -1,4 +1,3 @@
-import alesisvsysex.protocol
-import alesisvsysex.device
-import alesisvsysex.ui
+from alesisvsysex._lazy import lazy_submodules
 
+__getattr__, __dir__ = lazy_submodules(__name__, ['protocol', 'device', 'library', 'ui', 'cli'])
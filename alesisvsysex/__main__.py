@@ -1,9 +1,22 @@
 import sys
-from alesisvsysex.ui.main import main as uimain
+
+from alesisvsysex.cli import COMMANDS
+
+# Arguments that select the headless CLI when they come first
+CLI_ARGS = COMMANDS + ['-h', '--help', '--timeout']
+
+def wants_cli(args):
+    # Only the first argument decides: later ones may be option values or
+    # file names that happen to match a command
+    return bool(args) and args[0].split('=', 1)[0] in CLI_ARGS
 
 def main():
+    # Subcommands run headless; without one, launch the GUI
+    if wants_cli(sys.argv[1:]):
+        from alesisvsysex.cli import main as climain
+        sys.exit(climain(sys.argv[1:]))
+    from alesisvsysex.ui.main import main as uimain
     sys.exit(uimain(sys.argv))
 
 if __name__ == "__main__":
     main()
-
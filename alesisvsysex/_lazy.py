@@ -0,0 +1,18 @@
+import importlib
+
+__all__ = ['lazy_submodules']
+
+def lazy_submodules(package, submodules):
+    # Returns module-level __getattr__ and __dir__ functions (PEP 562) that
+    # import the named submodules of `package` on first attribute access.
+    submodules = frozenset(submodules)
+
+    def __getattr__(name):
+        if name in submodules:
+            return importlib.import_module('%s.%s' % (package, name))
+        raise AttributeError("module '%s' has no attribute '%s'" % (package, name))
+
+    def __dir__():
+        return sorted(set(importlib.import_module(package).__dict__) | submodules)
+
+    return __getattr__, __dir__
@@ -0,0 +1,159 @@
+import argparse
+import os
+import sys
+
+from alesisvsysex.device.file import FileDevice
+from alesisvsysex.library.convert import FORMATS, convert_files, decode, encode
+from alesisvsysex.protocol.diff import diff
+from alesisvsysex.protocol.validate import ensure_valid, validate
+
+__all__ = ['main', 'COMMANDS']
+
+# Headless entry point. Nothing here may import PyQt5 or alesisvsysex.ui;
+# the MIDI backend is only loaded when a command actually talks to a device.
+
+DEVICE_PREFIX = 'midi:'
+
+def open_device(source):
+    from alesisvsysex.device.alesis import AlesisV25Device
+    return AlesisV25Device(source[len(DEVICE_PREFIX):] or None)
+
+def format_value(v):
+    return v.as_string() if hasattr(v, 'as_string') else v.as_int()
+
+def read_model(source, timeout=None):
+    if source.startswith(DEVICE_PREFIX):
+        return open_device(source).get_config(timeout)
+    if source == '-':
+        return decode(sys.stdin.buffer.read())
+    with open(source, 'rb') as f:
+        return decode(f.read())
+
+def write_output(data, dest):
+    if dest is None or dest == '-':
+        sys.stdout.buffer.write(data)
+        sys.stdout.buffer.flush()
+    else:
+        with open(dest, 'wb') as f:
+            f.write(data)
+
+def cmd_dump(args):
+    model = read_model(args.source, args.timeout)
+    fmt = args.format or ('json' if args.output in (None, '-') else 'raw')
+    write_output(encode(model, fmt), args.output)
+    return 0
+
+def cmd_load(args):
+    model = read_model(args.source, args.timeout)
+    if args.check:
+        ensure_valid(model)
+    if args.output.startswith(DEVICE_PREFIX):
+        open_device(args.output).set_config(model, args.timeout, not args.no_verify)
+    else:
+        FileDevice(args.output).set_config(model)
+    return 0
+
+def cmd_diff(args):
+    patch = diff(read_model(args.a, args.timeout), read_model(args.b, args.timeout))
+    for p, old, new in patch.items(decode=True):
+        print("%s: %s -> %s" % (p, format_value(old), format_value(new)))
+    return 1 if patch else 0
+
+def cmd_convert(args):
+    if not os.path.isdir(args.input):
+        with open(args.input, 'rb') as f:
+            model = decode(f.read())
+        write_output(encode(model, args.to), args.output)
+        return 0
+
+    # A directory is converted file by file into a mirrored tree
+    if args.output is None:
+        raise ValueError("Converting a directory needs an output directory")
+    report = convert_files([args.input], args.output, args.to, args.jobs, args.chunk_size)
+    for r in report.failed:
+        print("%s: %s" % (r.source, r.error), file=sys.stderr)
+    print("converted %d of %d files (%d bytes) in %.2fs, %.0f files/s"
+          % (len(report.results) - len(report.failed), len(report.results),
+             report.bytes_read, report.elapsed, report.throughput), file=sys.stderr)
+    return 1 if report.failed else 0
+
+def cmd_verify(args):
+    failed = 0
+    for source in args.sources:
+        try:
+            violations = validate(read_model(source, args.timeout))
+        except (ValueError, OSError) as e:
+            failed += 1
+            print("%s: %s" % (source, e))
+            continue
+        if violations:
+            failed += 1
+            for v in violations:
+                print("%s: %s" % (source, v))
+        elif not args.quiet:
+            print("%s: ok" % source)
+    return 1 if failed else 0
+
+COMMANDS = ['dump', 'load', 'diff', 'convert', 'verify']
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='alesisvsysex',
+        description="Configure Alesis V-Series controllers without the GUI. "
+                    "A SOURCE is a file path, '-' for stdin, or '%s[PORT]' for a "
+                    "connected controller." % DEVICE_PREFIX)
+    parser.add_argument('--timeout', type=float, default=5.0,
+                        help="seconds to wait for a device reply (default: 5)")
+    sub = parser.add_subparsers(dest='command')
+
+    p = sub.add_parser('dump', help="read a configuration and write it out")
+    p.add_argument('source', nargs='?', default=DEVICE_PREFIX)
+    p.add_argument('-o', '--output', help="output file (default: stdout)")
+    p.add_argument('-f', '--format', choices=FORMATS,
+                   help="output format (default: json on stdout, raw otherwise)")
+    p.set_defaults(func=cmd_dump)
+
+    p = sub.add_parser('load', help="write a configuration to a device or file")
+    p.add_argument('source')
+    p.add_argument('output', nargs='?', default=DEVICE_PREFIX)
+    p.add_argument('--no-verify', action='store_true',
+                   help="do not read the configuration back from the device")
+    p.add_argument('--check', action='store_true',
+                   help="refuse configurations with out-of-range values")
+    p.set_defaults(func=cmd_load)
+
+    p = sub.add_parser('diff', help="list fields that differ between two configurations")
+    p.add_argument('a')
+    p.add_argument('b')
+    p.set_defaults(func=cmd_diff)
+
+    p = sub.add_parser('convert', help="convert between raw, framed and JSON files")
+    p.add_argument('input', help="a file, or a directory to convert recursively")
+    p.add_argument('output', nargs='?')
+    p.add_argument('-t', '--to', choices=FORMATS, default='raw')
+    p.add_argument('-j', '--jobs', type=int,
+                   help="worker processes for directories (default: CPU count)")
+    p.add_argument('--chunk-size', type=int, default=256,
+                   help="files per worker task (default: 256)")
+    p.set_defaults(func=cmd_convert)
+
+    p = sub.add_parser('verify', help="check that configurations decode and hold valid values")
+    p.add_argument('sources', nargs='+')
+    p.add_argument('-q', '--quiet', action='store_true')
+    p.set_defaults(func=cmd_verify)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command is None:
+        build_parser().print_usage()
+        return 2
+    try:
+        return args.func(args)
+    except (ValueError, OSError, RuntimeError) as e:
+        print("alesisvsysex: %s" % e, file=sys.stderr)
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
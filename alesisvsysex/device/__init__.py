@@ -1,3 +1,5 @@
-import alesisvsysex.device.alesis
-import alesisvsysex.device.file
+from alesisvsysex._lazy import lazy_submodules
 
+__getattr__, __dir__ = lazy_submodules(__name__, [
+    'metrics', 'alesis', 'file', 'aio', 'fleet', 'cache', 'emulator', 'store'
+])
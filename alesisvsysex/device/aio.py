@@ -0,0 +1,115 @@
+import asyncio
+
+import mido
+
+from alesisvsysex.device.alesis import AlesisV25Device
+from alesisvsysex.protocol.sysex import SysexMessage
+from alesisvsysex.protocol.validate import ensure_valid
+
+__all__ = ['AsyncAlesisV25Device']
+
+class AsyncAlesisV25Device (object):
+
+    # Incoming messages arrive on the MIDI backend's thread through the port
+    # callback and are handed to the event loop through an asyncio.Queue.
+    # Requests are serialized by a lock so that replies match their queries.
+
+    _PORT_PREFIX = AlesisV25Device._PORT_PREFIX
+
+    def __init__(self, port=None, timeout=1.0):
+        self.timeout = timeout
+        self._loop = None
+        self._queue = None
+        self._lock = None
+        self.discarded = 0
+
+        if port is None:
+            for name in mido.get_ioport_names():
+                if name.startswith(self._PORT_PREFIX):
+                    port = name
+                    break
+            else:
+                raise RuntimeError("Could not find a port named '%s'" % self._PORT_PREFIX)
+
+        if isinstance(port, str):
+            self._port = mido.open_ioport(port, callback=self._on_message)
+        else:
+            self._port = port
+            self._port.callback = self._on_message
+
+    def __del__(self):
+        try:
+            self.close()
+        except:
+            pass
+
+    def close(self):
+        self._port.close()
+
+    def _on_message(self, msg):
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._deliver, msg)
+
+    def _deliver(self, msg):
+        if msg.type == 'sysex':
+            self._queue.put_nowait(msg)
+        else:
+            self.discarded += 1
+
+    def _bind(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._lock = asyncio.Lock()
+
+    def _send(self, message):
+        if not isinstance(message, SysexMessage):
+            raise ValueError("Can only send a SysexMessage")
+        self._port.send(mido.Message.from_bytes(message.serialize()))
+
+    async def _recv(self, msg_type, timeout):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise asyncio.TimeoutError("No '%s' received within %.3fs"
+                                           % (msg_type, timeout))
+            r = await asyncio.wait_for(self._queue.get(), remaining)
+            try:
+                m = SysexMessage.deserialize(r.bin())
+            except ValueError:
+                self.discarded += 1
+                continue
+            if m.type == msg_type:
+                return m
+            self.discarded += 1
+
+    async def _query(self, timeout):
+        # Drop anything left over from an earlier, cancelled request
+        while not self._queue.empty():
+            self._queue.get_nowait()
+            self.discarded += 1
+        self._send(SysexMessage('query'))
+        return (await self._recv('reply', timeout)).model
+
+    async def get_config(self, timeout=None):
+        self._bind()
+        if timeout is None:
+            timeout = self.timeout
+        async with self._lock:
+            return await self._query(timeout)
+
+    async def set_config(self, model, timeout=None, check=False):
+        if check:
+            ensure_valid(model)
+        self._bind()
+        if timeout is None:
+            timeout = self.timeout
+        model_bin = model.serialize()
+        async with self._lock:
+            self._send(SysexMessage('update', model))
+            if (await self._query(timeout)).serialize() != model_bin:
+                raise RuntimeError('Failed to update configuration')
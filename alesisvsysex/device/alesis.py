@@ -1,19 +1,36 @@
+import collections
+import time
+
 import mido
+from alesisvsysex.device.metrics import DeviceStats, StatsReporter
 from alesisvsysex.protocol.sysex import SysexMessage
+from alesisvsysex.protocol.validate import ensure_valid
 
 __all__ = ['AlesisV25Device']
 
 class AlesisV25Device (object):
     
     _PORT_PREFIX = "V25:V25 MIDI"
+    _POLL_INTERVAL = 0.001
+    # How long a reply to a timed out query is still expected
+    _LATE_REPLY_WINDOW = 2.0
     
-    def __init__(self):
-        for port in mido.get_ioport_names():
-            if port.startswith(self._PORT_PREFIX):
-                self._port = mido.open_ioport(port)
-                break
+    def __init__(self, port=None):
+        self._stats = DeviceStats()
+        self._late = collections.deque()
+        if port is None:
+            ports = self.find_ports()
+            if not ports:
+                raise RuntimeError("Could not find a port named '%s'" % self._PORT_PREFIX)
+            port = ports[0]
+        if isinstance(port, str):
+            self._port = mido.open_ioport(port)
         else:
-            raise RuntimeError("Could not find a port named '%s'" % self._PORT_PREFIX)
+            self._port = port
+
+    @classmethod
+    def find_ports(cls):
+        return [p for p in mido.get_ioport_names() if p.startswith(cls._PORT_PREFIX)]
     
     def __del__(self):
         try:
@@ -24,24 +41,84 @@ class AlesisV25Device (object):
     def _send(self, message):
         if not isinstance(message, SysexMessage):
             raise ValueError("Can only send a SysexMessage")
+        data = message.serialize()
         p = mido.Parser()
-        p.feed(message.serialize())
+        p.feed(data)
         self._port.send(p.get_message())
+        self._stats.incr('messages_sent')
+        self._stats.incr('bytes_sent', len(data))
 
-    def _recv(self):
-        while True:
-            r = self._port.receive()
-            if r.type == 'sysex':
-                break
-        return SysexMessage.deserialize(r.bin())
+    def _skip_late(self):
+        # True if a sysex message just received answers a query that already
+        # timed out. The device replies in order, so one reply is skipped per
+        # timed out query until its window expires.
+        now = time.monotonic()
+        while self._late and self._late[0] < now:
+            self._late.popleft()
+        if self._late:
+            self._late.popleft()
+            return True
+        return False
+
+    def _recv(self, timeout=None):
+        discarded = 0
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            while True:
+                if deadline is None:
+                    r = self._port.receive()
+                else:
+                    r = self._port.poll()
+                    if r is None:
+                        if time.monotonic() >= deadline:
+                            self._stats.incr('timeouts')
+                            self._late.append(time.monotonic() + self._LATE_REPLY_WINDOW)
+                            raise TimeoutError("No reply from device within %.3fs" % timeout)
+                        time.sleep(self._POLL_INTERVAL)
+                        continue
+                if r.type == 'sysex' and not self._skip_late():
+                    break
+                discarded += 1
+        finally:
+            self._stats.incr('discarded', discarded)
+        data = r.bin()
+        self._stats.incr('messages_received')
+        self._stats.incr('bytes_received', len(data))
+        return SysexMessage.deserialize(data)
+
+    def drain(self):
+        return [r for r in self._port.iter_pending() if r.type == 'sysex']
 
-    def get_config(self):
+    def stats(self):
+        return self._stats.snapshot()
+
+    def reset_stats(self):
+        self._stats.reset()
+
+    def start_reporter(self, interval, exporter=None):
+        return StatsReporter(self.stats, interval, exporter).start()
+
+    def get_config(self, timeout=None):
+        start = time.perf_counter()
+        # Drop anything left over from an earlier, timed out request
+        for r in self._port.iter_pending():
+            if r.type == 'sysex':
+                self._skip_late()
+            self._stats.incr('discarded')
         self._send(SysexMessage('query'))
-        return self._recv().model
+        model = self._recv(timeout).model
+        self._stats.observe('get_config', time.perf_counter() - start)
+        return model
     
-    def set_config(self, model):
+    def set_config(self, model, timeout=None, verify=True, check=False):
+        # With check=True out-of-range values are rejected here rather than
+        # by the device
+        if check:
+            ensure_valid(model)
+        start = time.perf_counter()
         model_bin = model.serialize()
         self._send(SysexMessage('update', model))
-        if self.get_config().serialize() != model_bin:
+        if verify and self.get_config(timeout).serialize() != model_bin:
+            self._stats.incr('verify_failures')
             raise RuntimeError('Failed to update configuration')
-
+        self._stats.observe('set_config', time.perf_counter() - start)
@@ -0,0 +1,57 @@
+import threading
+import time
+
+from alesisvsysex.protocol.model import AlesisV
+
+__all__ = ['CachedDevice']
+
+class CachedDevice (object):
+
+    # Wraps a device and serves get_config from the last confirmed config.
+    # The cache is dropped on writes (and refilled once a write is verified),
+    # when the device has sent sysex nobody asked for, or after `ttl` seconds.
+
+    def __init__(self, device, ttl=None):
+        self.device = device
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._data = None
+        self._stamp = 0
+
+    def invalidate(self):
+        with self._lock:
+            self._data = None
+
+    def _store(self, model):
+        self._data = model.serialize()
+        self._stamp = time.monotonic()
+
+    def _valid(self):
+        if self._data is None:
+            return False
+        if self.ttl is not None and time.monotonic() - self._stamp > self.ttl:
+            return False
+        drain = getattr(self.device, 'drain', None)
+        if drain is not None and drain():
+            return False
+        return True
+
+    def get_config(self, force=False, **kwargs):
+        with self._lock:
+            if not force and self._valid():
+                self.hits += 1
+                return AlesisV.deserialize(self._data)
+            self.misses += 1
+            self._data = None
+            model = self.device.get_config(**kwargs)
+            self._store(model)
+            return model.copy()
+
+    def set_config(self, model, **kwargs):
+        with self._lock:
+            self._data = None
+            self.device.set_config(model, **kwargs)
+            if kwargs.get('verify', True):
+                self._store(model)
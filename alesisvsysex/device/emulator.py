@@ -0,0 +1,132 @@
+import heapq
+import itertools
+import random
+import threading
+import time
+
+import mido
+
+from alesisvsysex.protocol.model import AlesisV
+from alesisvsysex.protocol.sysex import SysexMessage
+
+__all__ = ['EmulatedV25Port']
+
+class EmulatedV25Port (object):
+
+    # Stands in for the mido I/O port of a V25. It answers 'query' with a
+    # 'reply' carrying its current config and applies 'update' messages.
+    # Every message the port emits is delayed by `latency` plus a uniform
+    # random `jitter`, and dropped with probability `drop_rate`. Messages
+    # sent to the port are dropped with the same probability.
+
+    name = "V25:V25 MIDI Emulator"
+
+    def __init__(self, model=None, latency=0.0, jitter=0.0, drop_rate=0.0, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.drop_rate = drop_rate
+        self.closed = False
+        self.received = 0
+        self.dropped = 0
+        self._config = (model or AlesisV()).serialize()
+        self._random = random.Random(seed)
+        self._pending = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._callback = None
+
+    @property
+    def model(self):
+        return AlesisV.deserialize(self._config)
+
+    @model.setter
+    def model(self, model):
+        self._config = model.serialize()
+
+    @property
+    def callback(self):
+        return self._callback
+
+    @callback.setter
+    def callback(self, fn):
+        with self._cond:
+            self._callback = fn
+            pending = [m for _, __, m in sorted(self._pending)]
+            self._pending = []
+        if fn is not None:
+            for m in pending:
+                fn(m)
+
+    def close(self):
+        self.closed = True
+
+    def _drop(self):
+        if self.drop_rate and self._random.random() < self.drop_rate:
+            self.dropped += 1
+            return True
+        return False
+
+    def _delay(self):
+        d = self.latency
+        if self.jitter:
+            d += self._random.uniform(0, self.jitter)
+        return d
+
+    def inject(self, msg):
+        if self._drop():
+            return
+        delay = self._delay()
+        with self._cond:
+            if self._callback is None:
+                heapq.heappush(self._pending, (time.monotonic() + delay, next(self._seq), msg))
+                self._cond.notify_all()
+                return
+            fn = self._callback
+        if delay > 0:
+            t = threading.Timer(delay, fn, (msg,))
+            t.daemon = True
+            t.start()
+        else:
+            fn(msg)
+
+    def send(self, msg):
+        if self.closed:
+            raise ValueError("Send on closed port")
+        self.received += 1
+        if msg.type != 'sysex' or self._drop():
+            return
+        try:
+            m = SysexMessage.deserialize(msg.bin())
+        except ValueError:
+            return
+        if m.type == 'update':
+            self._config = m.model.serialize()
+        elif m.type == 'query':
+            reply = SysexMessage('reply', AlesisV.deserialize(self._config))
+            self.inject(mido.Message.from_bytes(reply.serialize()))
+
+    def poll(self):
+        with self._cond:
+            if self._pending and self._pending[0][0] <= time.monotonic():
+                return heapq.heappop(self._pending)[2]
+            return None
+
+    def iter_pending(self):
+        while True:
+            m = self.poll()
+            if m is None:
+                break
+            yield m
+
+    def receive(self, block=True):
+        if not block:
+            return self.poll()
+        with self._cond:
+            while True:
+                if self._pending:
+                    wait = self._pending[0][0] - time.monotonic()
+                    if wait <= 0:
+                        return heapq.heappop(self._pending)[2]
+                    self._cond.wait(wait)
+                else:
+                    self._cond.wait()
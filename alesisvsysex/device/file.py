@@ -1,17 +1,215 @@
+import mmap
+import os
+import struct
+
 from alesisvsysex.protocol.model import AlesisV
+from alesisvsysex.protocol.view import AlesisVView
 
-__all__ = ['FileDevice']
+__all__ = ['FileDevice', 'BankFileDevice']
 
 class FileDevice (object):
-    
+
     def __init__(self, filename):
         self.filename = filename
 
     def get_config(self):
         with open(self.filename, 'rb') as f:
             return AlesisV.deserialize(f.read())
-    
+
     def set_config(self, model):
         with open(self.filename, 'wb') as f:
             f.write(model.serialize())
 
+class BankFileDevice (object):
+
+    # Layout: header, then a fixed-size name per slot, then one fixed-size
+    # AlesisV record per slot. Names are UTF-8, NUL-padded; an empty name
+    # marks an unnamed slot.
+
+    _MAGIC = b'AVSB'
+    _VERSION = 1
+    _HEADER = struct.Struct('<4sHHIH2x')
+    _NAME_SIZE = 32
+
+    def __init__(self, filename, slot=0):
+        self.filename = filename
+        self.slot = slot
+        self._map = None
+        self._file = open(filename, 'r+b')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0)
+            magic, version, record_size, slots, name_size = \
+                self._HEADER.unpack_from(self._map)
+        except (ValueError, struct.error):
+            self._file.close()
+            raise ValueError("'%s' is not a bank file" % filename)
+
+        if magic != self._MAGIC or version != self._VERSION:
+            self.close()
+            raise ValueError("'%s' is not a version %d bank file"
+                             % (filename, self._VERSION))
+        if record_size != AlesisV.num_bytes():
+            self.close()
+            raise ValueError("Invalid record size %d in '%s', expected %d."
+                             % (record_size, filename, AlesisV.num_bytes()))
+
+        self._slots = slots
+        self._name_size = name_size
+        self._names_offset = self._HEADER.size
+        self._records_offset = self._names_offset + slots * name_size
+        if len(self._map) < self._records_offset + slots * record_size:
+            self.close()
+            raise ValueError("Bank file '%s' is truncated" % filename)
+
+        self._index = {}
+        for i in range(slots):
+            name = self.name(i)
+            if name and name not in self._index:
+                self._index[name] = i
+
+    def __del__(self):
+        try:
+            self.close()
+        except:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return self._slots
+
+    @classmethod
+    def create(cls, filename, slots, name_size=None):
+        if name_size is None:
+            name_size = cls._NAME_SIZE
+        with open(filename, 'wb') as f:
+            f.write(cls._HEADER.pack(cls._MAGIC, cls._VERSION, AlesisV.num_bytes(),
+                                     slots, name_size))
+            f.write(bytes(slots * name_size))
+            f.write(AlesisV().serialize() * slots)
+        return cls(filename)
+
+    @classmethod
+    def from_files(cls, filename, paths, name_size=None):
+        paths = list(paths)
+        bank = cls.create(filename, len(paths), name_size)
+        try:
+            bank.import_files(paths)
+        except:
+            bank.close()
+            raise
+        return bank
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def flush(self):
+        self._map.flush()
+
+    def _record_offset(self, slot):
+        if not 0 <= slot < self._slots:
+            raise IndexError("Invalid slot %d for bank with %d slots"
+                             % (slot, self._slots))
+        return self._records_offset + slot * AlesisV.num_bytes()
+
+    def name(self, slot):
+        if not 0 <= slot < self._slots:
+            raise IndexError("Invalid slot %d for bank with %d slots"
+                             % (slot, self._slots))
+        o = self._names_offset + slot * self._name_size
+        return self._map[o : o + self._name_size].rstrip(b'\x00').decode('utf-8')
+
+    def _encode_name(self, name):
+        # Names become file names in export_files(), so no path separators
+        raw = name.encode('utf-8')
+        if (len(raw) > self._name_size or b'\x00' in raw
+                or any(sep in name for sep in (os.sep, os.altsep, '/') if sep)):
+            raise ValueError("Invalid name '%s': must be at most %d bytes "
+                             "with no NUL characters or path separators"
+                             % (name, self._name_size))
+        return raw
+
+    def _file_name(self, path):
+        # Slot name for an imported file: its basename, cut to fit the slot
+        raw = os.path.splitext(os.path.basename(path))[0].encode('utf-8')
+        raw = raw.replace(b'\x00', b'')[:self._name_size]
+        return raw.decode('utf-8', 'ignore')
+
+    def set_name(self, slot, name):
+        raw = self._encode_name(name)
+        old = self.name(slot)
+        o = self._names_offset + slot * self._name_size
+        self._map[o : o + self._name_size] = raw.ljust(self._name_size, b'\x00')
+        if self._index.get(old) == slot:
+            del self._index[old]
+        if name and name not in self._index:
+            self._index[name] = slot
+
+    def find(self, name):
+        return self._index.get(name)
+
+    def read(self, slot):
+        o = self._record_offset(slot)
+        return self._map[o : o + AlesisV.num_bytes()]
+
+    def write(self, slot, data):
+        o = self._record_offset(slot)
+        if len(data) != AlesisV.num_bytes():
+            raise ValueError("Expected %d bytes, got %d."
+                             % (AlesisV.num_bytes(), len(data)))
+        self._map[o : o + len(data)] = data
+
+    def get_model(self, slot):
+        return AlesisV.deserialize(self.read(slot))
+
+    def set_model(self, slot, model, name=None):
+        if name is not None:
+            self._encode_name(name)
+        self.write(slot, model.serialize())
+        if name is not None:
+            self.set_name(slot, name)
+
+    def view(self, slot):
+        # Edits through the view go straight to the mapped file. The bank
+        # cannot be closed while views are alive.
+        return AlesisVView(memoryview(self._map), self._record_offset(slot))
+
+    def get_config(self):
+        return self.get_model(self.slot)
+
+    def set_config(self, model):
+        self.set_model(self.slot, model)
+
+    def import_files(self, paths, start=0):
+        paths = list(paths)
+        if start + len(paths) > self._slots:
+            raise ValueError("Cannot import %d files at slot %d into a bank "
+                             "with %d slots" % (len(paths), start, self._slots))
+        # Read everything first so a bad file leaves the bank untouched
+        models = [FileDevice(path).get_config() for path in paths]
+        for i, (path, model) in enumerate(zip(paths, models)):
+            self.set_model(start + i, model, self._file_name(path))
+
+    def export_files(self, directory):
+        names = [(self.name(i) or 'slot%04d' % i) + '.syx' for i in range(self._slots)]
+        seen = set()
+        for name in names:
+            # Banks written by other tools may hold names set_name() refuses
+            self._encode_name(name[:-len('.syx')])
+            if name in seen:
+                raise ValueError("Several slots would be exported as '%s'." % name)
+            seen.add(name)
+        paths = []
+        for i, name in enumerate(names):
+            path = os.path.join(directory, name)
+            with open(path, 'wb') as f:
+                f.write(self.read(i))
+            paths.append(path)
+        return paths
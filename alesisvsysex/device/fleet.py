@@ -0,0 +1,79 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from alesisvsysex.device.alesis import AlesisV25Device
+
+__all__ = ['AlesisV25Fleet', 'FleetResult']
+
+class FleetResult (object):
+
+    def __init__(self, name, ok, elapsed, error=None, model=None):
+        self.name = name
+        self.ok = ok
+        self.elapsed = elapsed
+        self.error = error
+        self.model = model
+
+    def __repr__(self):
+        if self.ok:
+            return "<FleetResult %s: ok in %.3fs>" % (self.name, self.elapsed)
+        return "<FleetResult %s: failed in %.3fs: %s>" % (self.name, self.elapsed, self.error)
+
+class AlesisV25Fleet (object):
+
+    # Drives several controllers at once. Each device is only ever used by
+    # one pool thread at a time, so the per-device protocol stays sequential.
+
+    def __init__(self, devices, timeout=None, max_workers=None):
+        self.devices = dict(devices)
+        if not self.devices:
+            raise RuntimeError("A fleet needs at least one device")
+        self.timeout = timeout
+        self.max_workers = max_workers or len(self.devices)
+
+    @classmethod
+    def discover(cls, timeout=None, max_workers=None):
+        names = AlesisV25Device.find_ports()
+        if not names:
+            raise RuntimeError("Could not find a port named '%s'"
+                               % AlesisV25Device._PORT_PREFIX)
+        return cls({n: AlesisV25Device(n) for n in names}, timeout, max_workers)
+
+    def close(self):
+        for d in self.devices.values():
+            try:
+                d._port.close()
+            except:
+                pass
+
+    def _run(self, tasks):
+        def timed(name, fn, *args):
+            start = time.perf_counter()
+            try:
+                r = fn(*args)
+            except Exception as e:
+                return FleetResult(name, False, time.perf_counter() - start, error=e)
+            return FleetResult(name, True, time.perf_counter() - start, model=r)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [pool.submit(timed, name, *task) for name, task in tasks]
+            return {f.result().name: f.result() for f in futures}
+
+    def push(self, models, verify=True, check=False):
+        if isinstance(models, dict):
+            unknown = set(models) - set(self.devices)
+            if unknown:
+                raise ValueError("Unknown devices: %s" % ', '.join(sorted(unknown)))
+            targets = models
+        else:
+            targets = {name: models for name in self.devices}
+
+        def push_one(device, model):
+            device.set_config(model, self.timeout, verify, check)
+
+        return self._run([(name, (push_one, self.devices[name], model))
+                          for name, model in targets.items()])
+
+    def pull(self):
+        return self._run([(name, (d.get_config, self.timeout))
+                          for name, d in self.devices.items()])
@@ -0,0 +1,123 @@
+import bisect
+import logging
+import threading
+
+__all__ = ['LatencyHistogram', 'DeviceStats', 'StatsReporter']
+
+class LatencyHistogram (object):
+
+    # Bucket upper bounds in seconds; the last bucket is unbounded
+    _BOUNDS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0)
+
+    def __init__(self, bounds=None):
+        self.bounds = tuple(bounds or self._BOUNDS)
+        self.reset()
+
+    def reset(self):
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q):
+        # Upper bound of the bucket holding the q-th percentile
+        if not self.count:
+            return None
+        rank = q / 100.0 * self.count
+        seen = 0
+        for bound, n in zip(self.bounds, self.counts):
+            seen += n
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.total / self.count if self.count else None,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.percentile(50),
+            'p99': self.percentile(99),
+            'buckets': list(zip(self.bounds + (None,), self.counts))
+        }
+
+class DeviceStats (object):
+
+    _COUNTERS = ('messages_sent', 'messages_received', 'bytes_sent', 'bytes_received',
+                 'discarded', 'timeouts', 'verify_failures')
+    _HISTOGRAMS = ('get_config', 'set_config')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counters = {k: 0 for k in self._COUNTERS}
+            self.histograms = {k: LatencyHistogram() for k in self._HISTOGRAMS}
+
+    def incr(self, counter, n=1):
+        with self._lock:
+            self.counters[counter] += n
+
+    def observe(self, histogram, seconds):
+        with self._lock:
+            self.histograms[histogram].observe(seconds)
+
+    def snapshot(self):
+        with self._lock:
+            snap = dict(self.counters)
+            for k, h in self.histograms.items():
+                snap[k] = h.snapshot()
+            return snap
+
+class StatsReporter (object):
+
+    # Calls `exporter(snapshot)` every `interval` seconds from a daemon thread.
+    # The default exporter logs a one-line summary.
+
+    def __init__(self, source, interval, exporter=None):
+        self.source = source
+        self.interval = interval
+        self.exporter = exporter or self._log
+        self._stop = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def _log(snap):
+        get = snap['get_config']
+        logging.getLogger('alesisvsysex.device').info(
+            "sent=%d recv=%d discarded=%d timeouts=%d verify_failures=%d "
+            "get_config n=%d mean=%s max=%s",
+            snap['messages_sent'], snap['messages_received'], snap['discarded'],
+            snap['timeouts'], snap['verify_failures'], get['count'],
+            '%.4fs' % get['mean'] if get['mean'] is not None else '-',
+            '%.4fs' % get['max'] if get['max'] is not None else '-')
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.exporter(self.source())
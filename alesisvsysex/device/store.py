@@ -0,0 +1,174 @@
+import collections
+import json
+import os
+import tempfile
+
+from alesisvsysex.protocol.model import AlesisV
+from alesisvsysex.protocol.sysex import content_hash, read_payload
+
+__all__ = ['PresetStore', 'StoreDevice']
+
+def _write_atomic(filename, data):
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(filename), prefix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, filename)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+class PresetStore (object):
+
+    # Content-addressed storage for AlesisV payloads. Objects live under
+    # objects/<2 hex>/<62 hex>, named by the SHA-256 of the payload, so
+    # identical configurations are stored once. refs.json maps names to
+    # hashes. Decoded models are kept in an LRU cache keyed by hash.
+
+    _REFS = 'refs.json'
+
+    def __init__(self, root, cache_size=256):
+        self.root = root
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._cache = collections.OrderedDict()
+        os.makedirs(os.path.join(root, 'objects'), exist_ok=True)
+        try:
+            with open(os.path.join(root, self._REFS)) as f:
+                self._refs = json.load(f)
+        except FileNotFoundError:
+            self._refs = {}
+
+    def _object_path(self, h):
+        return os.path.join(self.root, 'objects', h[:2], h[2:])
+
+    def _save_refs(self):
+        data = json.dumps(self._refs, indent=2, sort_keys=True) + '\n'
+        _write_atomic(os.path.join(self.root, self._REFS), data.encode('utf-8'))
+
+    def __contains__(self, h):
+        return os.path.exists(self._object_path(h))
+
+    def __len__(self):
+        return sum(len(files) for _, __, files in os.walk(os.path.join(self.root, 'objects')))
+
+    def put(self, config):
+        # Stores a model or payload and returns its hash; existing objects
+        # are not rewritten
+        payload = config.serialize() if hasattr(config, 'serialize') else read_payload(config)
+        if len(payload) != AlesisV.num_bytes():
+            raise ValueError("Expected %d bytes of configuration, got %d."
+                             % (AlesisV.num_bytes(), len(payload)))
+        h = content_hash(payload)
+        path = self._object_path(h)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            _write_atomic(path, payload)
+        return h
+
+    def read(self, h):
+        try:
+            with open(self._object_path(h), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            raise KeyError(h)
+
+    def decode(self, payload, h=None):
+        # Decodes through the cache. The returned model is shared with the
+        # cache and must not be modified; get() hands out copies.
+        if h is None:
+            h = content_hash(payload)
+        try:
+            model = self._cache[h]
+        except KeyError:
+            self.misses += 1
+            model = self._cache[h] = AlesisV.deserialize(payload)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        else:
+            self.hits += 1
+            self._cache.move_to_end(h)
+        return model
+
+    def get(self, h, copy=True):
+        model = self._cache.get(h)
+        if model is None:
+            model = self.decode(self.read(h), h)
+        else:
+            self.hits += 1
+            self._cache.move_to_end(h)
+        return model.copy() if copy else model
+
+    def refs(self):
+        return dict(self._refs)
+
+    def resolve(self, name):
+        try:
+            return self._refs[name]
+        except KeyError:
+            raise KeyError("No preset named '%s'" % name)
+
+    def set_ref(self, name, h):
+        if h not in self:
+            raise KeyError(h)
+        self._refs[name] = h
+        self._save_refs()
+
+    def remove_ref(self, name):
+        self.resolve(name)
+        del self._refs[name]
+        self._save_refs()
+
+    def load(self, name, copy=True):
+        return self.get(self.resolve(name), copy)
+
+    def save(self, name, config):
+        h = self.put(config)
+        self._refs[name] = h
+        self._save_refs()
+        return h
+
+    def import_files(self, paths, names=None):
+        # Imports raw or framed .syx files, named after the files by default.
+        # Returns {name: hash}; duplicates share one object.
+        paths = list(paths)
+        if names is None:
+            names = [os.path.basename(p) for p in paths]
+        names = list(names)
+        if len(names) != len(paths):
+            raise ValueError("Got %d names for %d files" % (len(names), len(paths)))
+        added = {}
+        for path, name in zip(paths, names):
+            with open(path, 'rb') as f:
+                added[name] = self.put(f.read())
+        self._refs.update(added)
+        self._save_refs()
+        return added
+
+    def gc(self):
+        # Deletes objects no ref points to; returns how many were removed
+        live = set(self._refs.values())
+        removed = 0
+        objects = os.path.join(self.root, 'objects')
+        for d in os.listdir(objects):
+            for f in os.listdir(os.path.join(objects, d)):
+                if d + f not in live:
+                    os.unlink(os.path.join(objects, d, f))
+                    self._cache.pop(d + f, None)
+                    removed += 1
+        return removed
+
+class StoreDevice (object):
+
+    # The FileDevice interface over a named ref in a PresetStore
+
+    def __init__(self, store, name):
+        self.store = store
+        self.name = name
+
+    def get_config(self):
+        return self.store.load(self.name)
+
+    def set_config(self, model):
+        self.store.save(self.name, model)
@@ -0,0 +1,4 @@
+from alesisvsysex._lazy import lazy_submodules
+
+# alesisvsysex.library.array requires numpy
+__getattr__, __dir__ = lazy_submodules(__name__, ['array', 'catalog', 'convert'])
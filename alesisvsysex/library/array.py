@@ -0,0 +1,155 @@
+import fnmatch
+import os
+
+import numpy as np
+
+from alesisvsysex.protocol.codec import StructCodec
+from alesisvsysex.protocol.model import AlesisV
+from alesisvsysex.protocol.types import AbstractEnumValue
+from alesisvsysex.protocol.validate import Validator
+
+__all__ = ['model_dtype', 'PresetBank']
+
+def model_dtype(cls=AlesisV):
+    return np.dtype([(p, np.uint8) for p in StructCodec.for_class(cls).paths])
+
+class PresetBank (object):
+
+    def __init__(self, records, names=None):
+        if records.dtype != model_dtype():
+            raise ValueError("Invalid record type, expected the AlesisV layout.")
+        if names is not None and len(names) != len(records):
+            raise ValueError("Got %d names for %d records."
+                             % (len(names), len(records)))
+        self.records = records
+        self.names = list(names) if names is not None else [None] * len(records)
+
+    @classmethod
+    def from_bytes(cls, b, names=None):
+        n = AlesisV.num_bytes()
+        if len(b) % n:
+            raise ValueError("Bank size %d is not a multiple of the record size %d."
+                             % (len(b), n))
+        records = np.frombuffer(bytearray(b), dtype=model_dtype())
+        return cls(records, names)
+
+    @classmethod
+    def from_models(cls, models, names=None):
+        return cls.from_bytes(b''.join(m.serialize() for m in models), names)
+
+    @classmethod
+    def load(cls, source):
+        if isinstance(source, str) and os.path.isdir(source):
+            paths = sorted(os.path.join(source, f) for f in os.listdir(source)
+                           if f.lower().endswith('.syx'))
+        elif isinstance(source, str):
+            paths = [source]
+        else:
+            paths = list(source)
+
+        n = AlesisV.num_bytes()
+        chunks = []
+        names = []
+        for path in paths:
+            with open(path, 'rb') as f:
+                data = f.read()
+            if len(data) == 0 or len(data) % n:
+                raise ValueError("File '%s' does not contain raw %d-byte presets."
+                                 % (path, n))
+            count = len(data) // n
+            chunks.append(data)
+            if count == 1:
+                names.append(path)
+            else:
+                names.extend('%s[%d]' % (path, i) for i in range(count))
+        return cls.from_bytes(b''.join(chunks), names)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, field):
+        return self.records[field]
+
+    def fields(self, pattern='*'):
+        return [p for p in self.records.dtype.names if fnmatch.fnmatchcase(p, pattern)]
+
+    def match(self, conditions):
+        mask = np.ones(len(self.records), dtype=bool)
+        for field, value in conditions.items():
+            mask &= self.records[field] == self._encode(field, value)
+        return mask
+
+    def match_any(self, pattern, value):
+        mask = np.zeros(len(self.records), dtype=bool)
+        for field in self.fields(pattern):
+            mask |= self.records[field] == self._encode(field, value)
+        return mask
+
+    def filter(self, mask):
+        idx = np.flatnonzero(mask)
+        return PresetBank(self.records[idx], [self.names[i] for i in idx])
+
+    def validate(self):
+        # Row mask of records passing the protocol.validate constraint table
+        ok = np.ones(len(self.records), dtype=bool)
+        v = Validator.for_class(AlesisV)
+        for field, table in zip(v.paths, v.tables):
+            ok &= np.frombuffer(table, dtype=np.uint8)[self.records[field]] == 0
+        for lo, hi in v.pairs:
+            ok &= self.records[v.paths[lo]] <= self.records[v.paths[hi]]
+        return ok
+
+    def violations(self):
+        return Validator.for_class(AlesisV).check_bank(self.records.tobytes())
+
+    def set(self, field, value, mask=None):
+        v = self._encode(field, value)
+        if not self.records.flags.writeable:
+            self.records = self.records.copy()
+        if mask is None:
+            self.records[field] = v
+        else:
+            self.records[field][mask] = v
+
+    def _encode(self, field, value):
+        codec = StructCodec.for_class(AlesisV)
+        try:
+            cls = codec.types[codec.offsets[field]]
+        except KeyError:
+            raise ValueError("Invalid field '%s'." % field)
+        if isinstance(value, np.integer):
+            value = int(value)
+        if isinstance(value, int) and not issubclass(cls, AbstractEnumValue):
+            if not 0 <= value <= 0xff:
+                raise ValueError("Invalid value '%d' for field '%s'." % (value, field))
+            return value
+        return cls(value).as_int()
+
+    def to_bytes(self, index=None):
+        if index is None:
+            return self.records.tobytes()
+        n = len(self.records)
+        if not -n <= index < n:
+            raise IndexError("Preset index %d out of range." % index)
+        return self.records[index % n : index % n + 1].tobytes()
+
+    def to_model(self, index):
+        return AlesisV.deserialize(self.to_bytes(index))
+
+    def to_models(self):
+        return [self.to_model(i) for i in range(len(self.records))]
+
+    def save(self, directory):
+        files = []
+        for i, name in enumerate(self.names):
+            if name is None or not name.endswith('.syx'):
+                name = 'preset%05d.syx' % i
+            files.append(os.path.basename(name))
+        seen = set()
+        for f in files:
+            if f in seen:
+                raise ValueError("Several presets would be saved as '%s'." % f)
+            seen.add(f)
+        for i, f in enumerate(files):
+            with open(os.path.join(directory, f), 'wb') as out:
+                out.write(self.to_bytes(i))
@@ -0,0 +1,242 @@
+import fnmatch
+import os
+import sqlite3
+
+from alesisvsysex.protocol.codec import StructCodec
+from alesisvsysex.protocol.model import AlesisV
+from alesisvsysex.protocol.sysex import content_hash, read_payload
+
+__all__ = ['PresetCatalog', 'ScanReport']
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS presets (
+    id      INTEGER PRIMARY KEY,
+    path    TEXT NOT NULL UNIQUE,
+    mtime   REAL,
+    size    INTEGER,
+    hash    TEXT NOT NULL,
+    data    BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fields (
+    preset  INTEGER NOT NULL,
+    field   TEXT NOT NULL,
+    value   INTEGER NOT NULL,
+    channel INTEGER
+);
+CREATE INDEX IF NOT EXISTS fields_lookup ON fields (field, value, channel);
+CREATE INDEX IF NOT EXISTS fields_preset ON fields (preset);
+CREATE INDEX IF NOT EXISTS presets_hash ON presets (hash);
+"""
+
+class ScanReport (object):
+
+    def __init__(self):
+        self.added = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.removed = 0
+        self.errors = []
+
+    def __repr__(self):
+        return ("<ScanReport added=%d updated=%d unchanged=%d removed=%d errors=%d>"
+                % (self.added, self.updated, self.unchanged, self.removed, len(self.errors)))
+
+class PresetCatalog (object):
+
+    # Indexes configurations in SQLite: one row per preset with its source
+    # path, mtime, size and content hash, and one row per leaf field with the
+    # channel of the control it belongs to. Field arguments to the queries
+    # are fnmatch patterns over dotted paths; they are expanded against the
+    # codec layout so that every lookup hits the (field, value, channel)
+    # index.
+
+    def __init__(self, database=':memory:'):
+        self.database = database
+        self.db = sqlite3.connect(database)
+        self.db.executescript(_SCHEMA)
+        codec = StructCodec.for_class(AlesisV)
+        self._codec = codec
+        self._channels = []
+        for path in codec.paths:
+            prefix = path.rpartition('.')[0]
+            self._channels.append(codec.offsets.get(prefix + '.channel'))
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM presets").fetchone()[0]
+
+    def __contains__(self, path):
+        return self.db.execute("SELECT 1 FROM presets WHERE path = ?",
+                               (path,)).fetchone() is not None
+
+    def paths(self):
+        return [r[0] for r in self.db.execute("SELECT path FROM presets ORDER BY path")]
+
+    def get(self, path):
+        row = self.db.execute("SELECT data FROM presets WHERE path = ?", (path,)).fetchone()
+        if row is None:
+            raise KeyError(path)
+        return AlesisV.deserialize(bytes(row[0]))
+
+    def _rows(self, preset_id, payload):
+        return [(preset_id, path, payload[i], None if c is None else payload[c])
+                for i, (path, c) in enumerate(zip(self._codec.paths, self._channels))]
+
+    def _store(self, path, payload, mtime=None, size=None):
+        # Returns True if the preset was new
+        if len(payload) != self._codec.size:
+            raise ValueError("Expected %d bytes of configuration, got %d."
+                             % (self._codec.size, len(payload)))
+        h = content_hash(payload)
+        row = self.db.execute("SELECT id, hash FROM presets WHERE path = ?", (path,)).fetchone()
+        if row is None:
+            cur = self.db.execute(
+                "INSERT INTO presets (path, mtime, size, hash, data) VALUES (?, ?, ?, ?, ?)",
+                (path, mtime, size, h, payload))
+            self.db.executemany("INSERT INTO fields VALUES (?, ?, ?, ?)",
+                                self._rows(cur.lastrowid, payload))
+            return True
+        preset_id, old = row
+        self.db.execute("UPDATE presets SET mtime = ?, size = ?, hash = ?, data = ? WHERE id = ?",
+                        (mtime, size, h, payload, preset_id))
+        if old != h:
+            self.db.execute("DELETE FROM fields WHERE preset = ?", (preset_id,))
+            self.db.executemany("INSERT INTO fields VALUES (?, ?, ?, ?)",
+                                self._rows(preset_id, payload))
+        return False
+
+    def add(self, path, config):
+        # Catalogs a model or payload under an arbitrary name, e.g. a dump
+        # taken from a device
+        payload = config.serialize() if hasattr(config, 'serialize') else read_payload(config)
+        with self.db:
+            return self._store(path, payload)
+
+    def remove(self, path):
+        with self.db:
+            row = self.db.execute("SELECT id FROM presets WHERE path = ?", (path,)).fetchone()
+            if row is None:
+                raise KeyError(path)
+            self.db.execute("DELETE FROM fields WHERE preset = ?", row)
+            self.db.execute("DELETE FROM presets WHERE id = ?", row)
+
+    def scan(self, source, recursive=True):
+        # Indexes the .syx files under a directory (or a file, or a list of
+        # files). Files whose mtime and size match the catalog are skipped;
+        # entries for files that disappeared from a scanned directory are
+        # dropped.
+        report = ScanReport()
+        if isinstance(source, str) and os.path.isfile(source):
+            source = [source]
+        if isinstance(source, str):
+            if not os.path.isdir(source):
+                raise ValueError("'%s' is not a file or directory" % source)
+            root = os.path.abspath(source)
+            files = []
+            for dirpath, dirnames, filenames in os.walk(root):
+                files.extend(os.path.join(dirpath, f) for f in filenames
+                             if f.lower().endswith('.syx'))
+                if not recursive:
+                    break
+        else:
+            root = None
+            files = [os.path.abspath(f) for f in source]
+
+        with self.db:
+            known = {}
+            for path, mtime, size in self.db.execute("SELECT path, mtime, size FROM presets"):
+                known[path] = (mtime, size)
+
+            for path in sorted(files):
+                try:
+                    st = os.stat(path)
+                    if known.get(path) == (st.st_mtime, st.st_size):
+                        report.unchanged += 1
+                        continue
+                    with open(path, 'rb') as f:
+                        payload = read_payload(f.read())
+                    if self._store(path, payload, st.st_mtime, st.st_size):
+                        report.added += 1
+                    else:
+                        report.updated += 1
+                except (ValueError, OSError) as e:
+                    report.errors.append((path, str(e)))
+
+            if root is not None:
+                seen = set(files)
+                prefix = os.path.join(root, '')
+                for path in known:
+                    if path.startswith(prefix) and path not in seen:
+                        if not recursive and os.path.dirname(path) != root:
+                            continue
+                        row = self.db.execute("SELECT id FROM presets WHERE path = ?",
+                                              (path,)).fetchone()
+                        self.db.execute("DELETE FROM fields WHERE preset = ?", row)
+                        self.db.execute("DELETE FROM presets WHERE id = ?", row)
+                        report.removed += 1
+        return report
+
+    def _expand(self, pattern):
+        paths = fnmatch.filter(self._codec.paths, pattern)
+        if not paths:
+            raise ValueError("No fields match '%s'" % pattern)
+        return paths
+
+    def _encode(self, paths, value):
+        # Enum names are accepted as long as every matched field shares the type
+        if isinstance(value, str):
+            types = {self._codec.types[self._codec.offsets[p]] for p in paths}
+            if len(types) != 1:
+                raise ValueError("Cannot match '%s' against fields of several types" % value)
+            return types.pop()(value).as_int()
+        if hasattr(value, 'as_int'):
+            return value.as_int()
+        return value
+
+    def _condition(self, pattern, value, channel):
+        paths = self._expand(pattern)
+        sql = ("SELECT preset FROM fields WHERE field IN (%s) AND value = ?"
+               % ', '.join('?' * len(paths)))
+        args = paths + [self._encode(paths, value)]
+        if channel is not None:
+            sql += " AND channel = ?"
+            args.append(channel)
+        return sql, args
+
+    def find(self, pattern, value, channel=None):
+        # Presets where any field matching `pattern` holds `value`, optionally
+        # on a control set to `channel` (0-15, as stored)
+        return self.match([(pattern, value, channel)])
+
+    def match(self, conditions):
+        # Presets satisfying every (pattern, value[, channel]) condition
+        parts = []
+        args = []
+        for c in conditions:
+            pattern, value = c[0], c[1]
+            sql, a = self._condition(pattern, value, c[2] if len(c) > 2 else None)
+            parts.append(sql)
+            args.extend(a)
+        if not parts:
+            return self.paths()
+        sql = ("SELECT path FROM presets WHERE id IN (%s) ORDER BY path"
+               % ' INTERSECT '.join(parts))
+        return [r[0] for r in self.db.execute(sql, args)]
+
+    def duplicates(self):
+        # Groups of paths holding byte-identical configurations
+        groups = {}
+        for h, path in self.db.execute(
+                "SELECT hash, path FROM presets WHERE hash IN "
+                "(SELECT hash FROM presets GROUP BY hash HAVING COUNT(*) > 1) "
+                "ORDER BY hash, path"):
+            groups.setdefault(h, []).append(path)
+        return list(groups.values())
@@ -0,0 +1,140 @@
+import collections
+import json
+import os
+import time
+
+from alesisvsysex.protocol.codec import StructCodec
+from alesisvsysex.protocol.model import AlesisV
+from alesisvsysex.protocol.sysex import SysexMessage
+
+__all__ = ['FORMATS', 'decode', 'encode', 'convert_file', 'convert_files',
+           'ConvertResult', 'ConvertReport']
+
+FORMATS = ['raw', 'update', 'reply', 'json']
+
+def decode(data):
+    # Accepts a bare AlesisV payload (as written by FileDevice), a framed
+    # 'update'/'reply' message or a JSON field dump
+    msg_type = SysexMessage.classify(data)
+    if msg_type is not None:
+        if msg_type == 'query':
+            raise ValueError("A query message carries no configuration")
+        return SysexMessage.deserialize(data).model
+    if data[:1] == b'{':
+        return StructCodec.for_class(AlesisV).from_dict(json.loads(data.decode('utf-8')))
+    if len(data) != AlesisV.num_bytes():
+        raise ValueError("Expected %d bytes of raw configuration or a SysEx frame, got %d."
+                         % (AlesisV.num_bytes(), len(data)))
+    return AlesisV.deserialize(data)
+
+def encode(model, fmt):
+    if fmt == 'raw':
+        return model.serialize()
+    if fmt == 'json':
+        d = StructCodec.for_class(AlesisV).to_dict(model)
+        return (json.dumps(d, indent=2) + '\n').encode('utf-8')
+    return SysexMessage(fmt, model).serialize()
+
+class ConvertResult (object):
+
+    def __init__(self, source, dest, size=0, error=None):
+        self.source = source
+        self.dest = dest
+        self.size = size
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        if self.ok:
+            return "<ConvertResult %s -> %s>" % (self.source, self.dest)
+        return "<ConvertResult %s: %s>" % (self.source, self.error)
+
+class ConvertReport (object):
+
+    def __init__(self, results, elapsed):
+        self.results = results
+        self.elapsed = elapsed
+
+    @property
+    def failed(self):
+        return [r for r in self.results if not r.ok]
+
+    @property
+    def bytes_read(self):
+        return sum(r.size for r in self.results)
+
+    @property
+    def throughput(self):
+        # Files per second
+        return len(self.results) / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __repr__(self):
+        return ("<ConvertReport %d files, %d failed, %.1f files/s>"
+                % (len(self.results), len(self.failed), self.throughput))
+
+def convert_file(source, dest, fmt):
+    try:
+        with open(source, 'rb') as f:
+            data = f.read()
+        out = encode(decode(data), fmt)
+        with open(dest, 'wb') as f:
+            f.write(out)
+    except (ValueError, OSError) as e:
+        return ConvertResult(source, dest, 0, str(e))
+    return ConvertResult(source, dest, len(data))
+
+def _convert_chunk(jobs, fmt):
+    # Runs in a worker process; one call per chunk keeps pickling overhead
+    # per file low
+    return [convert_file(source, dest, fmt) for source, dest in jobs]
+
+def _output_name(path, fmt):
+    base = os.path.splitext(path)[0]
+    return base + ('.json' if fmt == 'json' else '.syx')
+
+def _plan(sources, dest, fmt):
+    # Pairs every input file with its output path. A directory source is
+    # walked and mirrored under `dest`.
+    jobs = []
+    for source in sources:
+        if os.path.isdir(source):
+            for dirpath, _, filenames in os.walk(source):
+                rel = os.path.relpath(dirpath, source)
+                for f in sorted(filenames):
+                    if os.path.splitext(f)[1].lower() in ('.syx', '.json'):
+                        jobs.append((os.path.join(dirpath, f),
+                                     os.path.normpath(os.path.join(dest, rel,
+                                                                   _output_name(f, fmt)))))
+        else:
+            jobs.append((source, os.path.join(dest, _output_name(os.path.basename(source), fmt))))
+    return jobs
+
+def convert_files(sources, dest, fmt, workers=None, chunk_size=256):
+    # Converts files and directory trees into `dest`, fanning chunks of
+    # files out over a process pool. `workers` defaults to the CPU count;
+    # small jobs and workers=1 run in this process.
+    if fmt not in FORMATS:
+        raise ValueError("Unknown format '%s'" % fmt)
+    start = time.perf_counter()
+    jobs = _plan(sources, dest, fmt)
+    # Sources that would be written to the same file (e.g. x.syx and x.json)
+    # are all reported as failed rather than overwriting each other
+    counts = collections.Counter(out for _, out in jobs)
+    results = [ConvertResult(source, out, 0, "Several files would be written to '%s'" % out)
+               for source, out in jobs if counts[out] > 1]
+    jobs = [(source, out) for source, out in jobs if counts[out] == 1]
+    for d in sorted({os.path.dirname(out) for _, out in jobs}):
+        os.makedirs(d, exist_ok=True)
+
+    chunks = [jobs[i : i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+    if workers == 1 or len(chunks) <= 1:
+        results.extend(_convert_chunk(jobs, fmt))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for chunk in pool.map(_convert_chunk, chunks, [fmt] * len(chunks)):
+                results.extend(chunk)
+    return ConvertReport(results, time.perf_counter() - start)
@@ -1,5 +1,6 @@
-import alesisvsysex.protocol.types
-import alesisvsysex.protocol.component
-import alesisvsysex.protocol.model
-import alesisvsysex.protocol.sysex
+from alesisvsysex._lazy import lazy_submodules
 
+__getattr__, __dir__ = lazy_submodules(__name__, [
+    'types', 'codec', 'component', 'model', 'view', 'sysex', 'stream', 'diff',
+    'fields', 'validate'
+])
@@ -0,0 +1,106 @@
+import operator
+import struct
+
+__all__ = ['StructCodec']
+
+class StructCodec (object):
+
+    _CACHE = {}
+
+    def __init__(self, cls):
+        self.cls = cls
+        self.paths = []
+        self.types = []
+        self._build = self._compile(cls, ())
+        self.offsets = {p: i for i, p in enumerate(self.paths)}
+        getter = operator.attrgetter(*self.paths)
+        self._getter = getter if len(self.paths) > 1 else (lambda model: (getter(model),))
+        self.struct = struct.Struct('%dB' % len(self.paths))
+        self.size = self.struct.size
+
+    @classmethod
+    def for_class(cls, component_cls):
+        try:
+            return cls._CACHE[component_cls]
+        except KeyError:
+            codec = cls._CACHE[component_cls] = cls(component_cls)
+            return codec
+
+    def _compile(self, cls, prefix):
+        # Returns a builder that constructs an instance of `cls` from the flat
+        # tuple of unpacked values. Leaves occupy exactly one byte each.
+        if hasattr(cls, '_COMPONENTS'):
+            children = [(k, c) for k, c, _ in cls._COMPONENTS]
+        elif hasattr(cls, '_PARAMS'):
+            children = [(k, c) for k, c, _ in cls._PARAMS]
+        else:
+            if cls.num_bytes() != 1:
+                raise ValueError("Cannot compile field '%s' of type '%s': "
+                                 "only single-byte values are supported."
+                                 % ('.'.join(prefix), cls.__name__))
+            i = len(self.paths)
+            self.paths.append('.'.join(prefix))
+            self.types.append(cls)
+            return lambda vals: cls(vals[i])
+
+        start = len(self.paths)
+        builders = [self._compile(c, prefix + (k,)) for k, c in children]
+        stop = len(self.paths)
+
+        if not any(hasattr(c, '_COMPONENTS') or hasattr(c, '_PARAMS') for _, c in children):
+            # All children are leaves. Values are immutable and interned, so
+            # decode each byte through a lookup table of prebuilt instances;
+            # fall back to the constructor to report invalid bytes.
+            types = self.types[start:stop]
+            tables = [_decode_table(t) for t in types]
+            def build(vals):
+                args = [t[v] for t, v in zip(tables, vals[start:stop])]
+                if None in args:
+                    args = [t(v) for t, v in zip(types, vals[start:stop])]
+                return cls(*args)
+            return build
+        return lambda vals: cls(*[b(vals) for b in builders])
+
+    def values(self, model):
+        return [v.as_int() for v in self._getter(model)]
+
+    def to_dict(self, model):
+        # Enum fields map to their names, everything else to ints
+        return {p: v.as_string() if hasattr(v, 'as_string') else v.as_int()
+                for p, v in zip(self.paths, self._getter(model))}
+
+    def from_dict(self, d):
+        unknown = set(d) - set(self.offsets)
+        if unknown:
+            raise ValueError("Invalid fields for '%s': %s"
+                             % (self.cls.__name__, ', '.join(sorted(unknown))))
+        missing = set(self.offsets) - set(d)
+        if missing:
+            raise ValueError("Missing fields for '%s': %s"
+                             % (self.cls.__name__, ', '.join(sorted(missing))))
+        return self.unpack(bytes(t(d[p]).as_int() for p, t in zip(self.paths, self.types)))
+
+    def pack(self, model):
+        return self.struct.pack(*self.values(model))
+
+    def unpack(self, b):
+        if len(b) < self.size:
+            raise ValueError("Expected %d bytes for '%s', got %d."
+                             % (self.size, self.cls.__name__, len(b)))
+        return self._build(self.struct.unpack_from(b))
+
+_DECODE_TABLES = {}
+
+def _decode_table(cls):
+    try:
+        return _DECODE_TABLES[cls]
+    except KeyError:
+        pass
+    table = []
+    for i in range(0x100):
+        try:
+            table.append(cls(i))
+        except ValueError:
+            table.append(None)
+    _DECODE_TABLES[cls] = table
+    return table
@@ -1,139 +1,161 @@
 import struct
 
-__all__ = ['CompoundComponent', 'BasicComponent']
+from alesisvsysex.protocol.codec import StructCodec
+
+__all__ = ['ComponentMeta', 'CompoundComponent', 'BasicComponent']
+
+class ComponentMeta (type):
+
+    # Compiles a component's _COMPONENTS or _PARAMS table, at class definition
+    # time, into __slots__ (so fields are plain slot descriptors) and a
+    # generated __init__.
+
+    def __new__(mcs, name, bases, ns):
+        if '_COMPONENTS' in ns:
+            fields = tuple(k for k, _, __ in ns['_COMPONENTS'])
+        elif '_PARAMS' in ns:
+            fields = tuple(k for k, _, __ in ns['_PARAMS'])
+        else:
+            fields = None
+
+        if fields is not None:
+            ns['_FIELDS'] = fields
+        ns.setdefault('__slots__', fields or ())
+
+        cls = super().__new__(mcs, name, bases, ns)
+
+        if '_COMPONENTS' in ns:
+            cls.__init__ = _compound_init(cls)
+        elif '_PARAMS' in ns:
+            cls.__init__ = _basic_init(cls)
+
+        return cls
+
+def _argument_count_error(cls, n, args):
+    return ValueError("Invalid argument count for component '%s': "
+                      "Expected %d, got %d."
+                      % (cls.__name__, n, len(args)))
+
+def _argument_error(cls, k):
+    return ValueError("Invalid argument '%s' for component '%s'."
+                      % (k, cls.__name__))
+
+def _compound_init(cls):
+    fields = cls._FIELDS
+    types = {k: c for k, c, _ in cls._COMPONENTS}
+    factories = tuple((c, v) for _, c, v in cls._COMPONENTS)
+    slots = tuple((k, c, getattr(cls, k).__set__) for k, c, _ in cls._COMPONENTS)
 
-class CompoundComponent (object):
-    
-    _COMPONENTS = []
-    
     def __init__(self, *args, **kwargs):
-    
-        # Initialize with default arguments
-        self._components = {k: cls(**v) for k, cls, v in self._COMPONENTS}
-        
-        # Try to initialize from positional arguments, if any
+
+        # Try to initialize from positional arguments, if any, otherwise
+        # initialize with default arguments
         if len(args):
-            if len(args) == len(self._COMPONENTS):
-                for (v, (k, cls, _)) in zip(args, self._COMPONENTS):
-                    if not isinstance(v, cls):
-                        raise ValueError("Got type '%s' for component '%s', "
-                                         "expected a '%s'."
-                                         % (v.__class__.__name__, k,
-                                            cls.__name__))
-                    self._components[k] = v
-            else:
-                raise ValueError("Invalid argument count for component '%s': "
-                                 "Expected %d, got %d."
-                                 % (self.__class__.__name__, len(self._COMPONENTS),
-                                    len(args)))
-        
+            if len(args) != len(fields):
+                raise _argument_count_error(self.__class__, len(fields), args)
+            for v, (k, c, setter) in zip(args, slots):
+                if not isinstance(v, c):
+                    raise ValueError("Got type '%s' for component '%s', "
+                                     "expected a '%s'."
+                                     % (v.__class__.__name__, k, c.__name__))
+                setter(self, v)
+        else:
+            for (c, v), (_, __, setter) in zip(factories, slots):
+                setter(self, c(**v))
+
         # Override with keyword arguments
         for k, v in kwargs.items():
             try:
-                cls = next(cls for kk, cls, _ in self._COMPONENTS if kk == k)
-                if not isinstance(v, cls):
-                    raise ValueError("Got type '%s' for component '%s', "
-                                     "expected a '%s'."
-                                     % (v.__class__.__name__, k,
-                                        cls.__name__))
-                self._components[k] = v
-            except StopIteration:
-                raise ValueError("Invalid argument '%s' for component '%s'."
-                                 % (k, self.__class__.__name__))
-     
+                c = types[k]
+            except KeyError:
+                raise _argument_error(self.__class__, k)
+            if not isinstance(v, c):
+                raise ValueError("Got type '%s' for component '%s', "
+                                 "expected a '%s'."
+                                 % (v.__class__.__name__, k, c.__name__))
+            object.__setattr__(self, k, v)
+
+    return __init__
+
+def _basic_init(cls):
+    fields = cls._FIELDS
+    types = {k: c for k, c, _ in cls._PARAMS}
+    # Values are immutable, so the defaults can be built once and shared
+    defaults = tuple(c(*a) for _, c, a in cls._PARAMS)
+    setters = tuple(getattr(cls, k).__set__ for k in fields)
+
+    def __init__(self, *args, **kwargs):
+
+        # Try to initialize from positional arguments, if any, otherwise
+        # initialize with default arguments
+        if len(args):
+            if len(args) != len(fields):
+                raise _argument_count_error(self.__class__, len(fields), args)
+            values = args
+        else:
+            values = defaults
+        for setter, v in zip(setters, values):
+            setter(self, v)
+
+        # Override with keyword arguments
+        for k, v in kwargs.items():
+            try:
+                c = types[k]
+            except KeyError:
+                raise _argument_error(self.__class__, k)
+            if not isinstance(v, c):
+                raise ValueError("Invalid type '%s' for field '%s' - expected '%s'."
+                                 % (v.__class__.__name__, k, c.__name__))
+            object.__setattr__(self, k, v)
+
+    return __init__
+
+class CompoundComponent (object, metaclass=ComponentMeta):
+
+    _COMPONENTS = []
+
     def copy(self):
-        return self.__class__(**{k: v.copy() for k, v in self._components.items()})
-     
+        return self.__class__(*[getattr(self, k).copy() for k in self._FIELDS])
+
     def serialize(self):
-        return b''.join(self._components[k].serialize() for k, cls, _ in self._COMPONENTS)
-        
-    def __setattr__(self, attr, value):
-        if '_components' in self.__dict__ and attr in self._params:
-            self._components[attr] = value
-        else:
-            return super().__setattr__(attr, value)
-    
-    def __getattr__(self, attr):
-        try:
-            return self.__dict__['_components'][attr]
-        except KeyError:
-            raise AttributeError
-    
+        return StructCodec.for_class(self.__class__).pack(self)
+
+    def __reduce__(self):
+        return (self.__class__, tuple(getattr(self, k) for k in self._FIELDS))
+
+    @property
+    def _components(self):
+        return {k: getattr(self, k) for k in self._FIELDS}
+
     @classmethod
     def num_bytes(cls):
-        return sum(c.num_bytes() for k, c, _ in cls._COMPONENTS)
-    
+        return StructCodec.for_class(cls).size
+
     @classmethod
     def deserialize(cls, bytes):
-        idx = 0
-        args = []
-        for k, comp, _ in cls._COMPONENTS:
-            l = comp.num_bytes()
-            args.append(comp.deserialize(bytes[idx:idx+l]))
-            idx += l
-        return cls(*args)
-    
-class BasicComponent (object):
-    
+        return StructCodec.for_class(cls).unpack(bytes)
+
+class BasicComponent (object, metaclass=ComponentMeta):
+
     _PARAMS = []
-    
-    def __init__(self, *args, **kwargs):
-    
-        # Initialize with default arguments
-        self._params = {k: cls(*args) for k, cls, args in self._PARAMS}
-        
-        # Try to initialize from positional arguments, if any
-        if len(args):
-            if len(args) == len(self._PARAMS):
-                for (v, (k, cls, _)) in zip(args, self._PARAMS):
-                    self._params[k] = v
-            else:
-                raise ValueError("Invalid argument count for component '%s': "
-                                 "Expected %d, got %d."
-                                 % (self.__class__.__name__, len(self._PARAMS),
-                                    len(args)))
-        
-        # Override with keyword arguments
-        for k, v in kwargs.items():
-            try:
-                cls = next(cls for kk, cls, _ in self._PARAMS if kk == k)
-                if not isinstance(v, cls):
-                    raise ValueError("Invalid type '%s' for field '%s' - expected '%s'."
-                                     % (v.__class__.__name__, k, cls.__name__))
-                self._params[k] = v
-            except StopIteration:
-                raise ValueError("Invalid argument '%s' for component '%s'."
-                                 % (k, self.__class__.__name__))
-    
+
     def copy(self):
-        return self.__class__(**{k: v for k, v in self._params.items()})
-    
+        return self.__class__(*[getattr(self, k) for k in self._FIELDS])
+
     def serialize(self):
-        return b''.join([self._params[k].serialize() for (k, cls, _) in self._PARAMS])
-    
-    def __setattr__(self, attr, value):
-        if '_params' in self.__dict__ and attr in self._params:
-            self._params[attr] = value
-        else:
-            return super().__setattr__(attr, value)
-    
-    def __getattr__(self, attr):
-        try:
-            return self.__dict__['_params'][attr]
-        except KeyError:
-            raise AttributeError
-    
+        return StructCodec.for_class(self.__class__).pack(self)
+
+    def __reduce__(self):
+        return (self.__class__, tuple(getattr(self, k) for k in self._FIELDS))
+
+    @property
+    def _params(self):
+        return {k: getattr(self, k) for k in self._FIELDS}
+
     @classmethod
     def num_bytes(cls):
-        return sum(cls2.num_bytes() for k, cls2, _ in cls._PARAMS)
-    
+        return StructCodec.for_class(cls).size
+
     @classmethod
     def deserialize(cls, bytes):
-        idx = 0
-        args = []
-        for k, cls2, _ in cls._PARAMS:
-            l = cls2.num_bytes()
-            args.append(cls2.deserialize(bytes[idx:idx+l]))
-            idx += l
-        return cls(*args)
-
+        return StructCodec.for_class(cls).unpack(bytes)
@@ -0,0 +1,131 @@
+from alesisvsysex.protocol.codec import StructCodec
+from alesisvsysex.protocol.model import AlesisV
+
+__all__ = ['Patch', 'diff', 'diff_bank']
+
+class Patch (object):
+
+    # A set of byte-level changes to a serialized model, as a sorted tuple of
+    # (offset, old, new). Offsets map back to field paths through the codec.
+
+    __slots__ = ('changes', 'cls')
+
+    def __init__(self, changes=(), cls=AlesisV):
+        self.changes = tuple(changes)
+        self.cls = cls
+
+    def __len__(self):
+        return len(self.changes)
+
+    def __bool__(self):
+        return bool(self.changes)
+
+    def __iter__(self):
+        return iter(self.changes)
+
+    def __eq__(self, other):
+        return (isinstance(other, Patch) and self.cls is other.cls
+                and self.changes == other.changes)
+
+    def __hash__(self):
+        return hash(self.changes)
+
+    def __repr__(self):
+        return "<Patch %s>" % ', '.join("%s: %d -> %d" % c for c in self.items())
+
+    def paths(self):
+        paths = StructCodec.for_class(self.cls).paths
+        return [paths[o] for o, _, __ in self.changes]
+
+    def items(self, decode=False):
+        # With `decode`, old and new are returned as value objects
+        codec = StructCodec.for_class(self.cls)
+        if decode:
+            return [(codec.paths[o], codec.types[o](old), codec.types[o](new))
+                    for o, old, new in self.changes]
+        return [(codec.paths[o], old, new) for o, old, new in self.changes]
+
+    def invert(self):
+        return Patch(((o, new, old) for o, old, new in self.changes), self.cls)
+
+    def apply(self, target, check=True):
+        # bytearrays and models are patched in place; bytes are copied.
+        # With `check`, every changed field must still hold its old value;
+        # all fields are checked before anything is written, so a conflict
+        # leaves the target untouched.
+        if isinstance(target, self.cls):
+            return self._apply_model(target, check)
+        codec = StructCodec.for_class(self.cls)
+        if len(target) != codec.size:
+            raise ValueError("Expected %d bytes, got %d." % (codec.size, len(target)))
+        if check:
+            for o, old, new in self.changes:
+                if target[o] != old:
+                    raise ValueError("Patch conflict at '%s': expected %d, found %d."
+                                     % (codec.paths[o], old, target[o]))
+        out = target if isinstance(target, bytearray) else bytearray(target)
+        for o, old, new in self.changes:
+            out[o] = new
+        return out if isinstance(target, bytearray) else bytes(out)
+
+    def _apply_model(self, model, check):
+        codec = StructCodec.for_class(self.cls)
+        fields = []
+        for o, old, new in self.changes:
+            parts = codec.paths[o].split('.')
+            obj = model
+            for p in parts[:-1]:
+                obj = getattr(obj, p)
+            if check and getattr(obj, parts[-1]).as_int() != old:
+                raise ValueError("Patch conflict at '%s': expected %d, found %d."
+                                 % (codec.paths[o], old, getattr(obj, parts[-1]).as_int()))
+            fields.append((obj, parts[-1], codec.types[o](new)))
+        for obj, name, value in fields:
+            setattr(obj, name, value)
+        return model
+
+def _as_bytes(x):
+    if hasattr(x, 'serialize'):
+        return x.serialize()
+    return x
+
+def _changes(a, b):
+    return tuple((i, x, y) for i, (x, y) in enumerate(zip(a, b)) if x != y)
+
+def diff(a, b, cls=AlesisV):
+    a = _as_bytes(a)
+    b = _as_bytes(b)
+    n = StructCodec.for_class(cls).size
+    if len(a) != n or len(b) != n:
+        raise ValueError("Expected two %d-byte configurations, got %d and %d."
+                         % (n, len(a), len(b)))
+    if a == b:
+        return Patch((), cls)
+    return Patch(_changes(a, b), cls)
+
+def diff_bank(records, reference, cls=AlesisV):
+    # `records` is either an iterable of configurations or one buffer holding
+    # consecutive raw records. Returns one Patch per record; records equal to
+    # the reference are settled by a single bytes comparison.
+    ref = bytes(_as_bytes(reference))
+    n = StructCodec.for_class(cls).size
+    if len(ref) != n:
+        raise ValueError("Expected a %d-byte reference, got %d." % (n, len(ref)))
+    if isinstance(records, (bytes, bytearray, memoryview)):
+        if len(records) % n:
+            raise ValueError("Bank size %d is not a multiple of the record size %d."
+                             % (len(records), n))
+        mv = memoryview(records)
+        records = (mv[i : i + n] for i in range(0, len(mv), n))
+
+    empty = Patch((), cls)
+    out = []
+    for r in records:
+        r = _as_bytes(r)
+        if r == ref:
+            out.append(empty)
+        elif len(r) != n:
+            raise ValueError("Expected a %d-byte record, got %d." % (n, len(r)))
+        else:
+            out.append(Patch(_changes(ref, r), cls))
+    return out
@@ -0,0 +1,83 @@
+from alesisvsysex.protocol.codec import StructCodec
+from alesisvsysex.protocol.model import AlesisV
+from alesisvsysex.protocol.types import AbstractEnumValue
+
+__all__ = ['FieldIndex', 'get_field', 'set_field']
+
+class FieldIndex (object):
+
+    # Maps dotted leaf paths to (offset, type) so single fields can be read
+    # and written on serialized configurations without building a model.
+    # `offset` shifts every field, e.g. to address a record inside a bank
+    # buffer or the payload of a SysEx frame.
+
+    _CACHE = {}
+
+    def __init__(self, cls):
+        codec = StructCodec.for_class(cls)
+        self.cls = cls
+        self.size = codec.size
+        self.fields = {p: (i, t) for i, (p, t) in enumerate(zip(codec.paths, codec.types))}
+
+    @classmethod
+    def for_class(cls, component_cls):
+        try:
+            return cls._CACHE[component_cls]
+        except KeyError:
+            index = cls._CACHE[component_cls] = cls(component_cls)
+            return index
+
+    def __contains__(self, path):
+        return path in self.fields
+
+    def __iter__(self):
+        return iter(self.fields)
+
+    def lookup(self, path):
+        try:
+            return self.fields[path]
+        except KeyError:
+            raise KeyError("Invalid field '%s' for '%s'" % (path, self.cls.__name__))
+
+    def _check(self, buf, offset):
+        if len(buf) < offset + self.size:
+            raise ValueError("Expected %d bytes for '%s' at offset %d, got %d."
+                             % (self.size, self.cls.__name__, offset, len(buf)))
+
+    def get(self, buf, path, offset=0):
+        i, t = self.lookup(path)
+        self._check(buf, offset)
+        return t(buf[offset + i])
+
+    def encode(self, path, value):
+        # Accepts a value object, an int or, for enum fields, a member name
+        i, t = self.lookup(path)
+        if isinstance(value, str) and not issubclass(t, AbstractEnumValue):
+            raise ValueError("Field '%s' expects an int, got '%s'." % (path, value))
+        if isinstance(value, (int, str)):
+            value = t(value)
+        elif not isinstance(value, t):
+            raise ValueError("Invalid type '%s' for field '%s' - expected '%s'."
+                             % (value.__class__.__name__, path, t.__name__))
+        v = value.as_int()
+        if not 0 <= v <= 0xff:
+            raise ValueError("Value %d for field '%s' does not fit in a byte." % (v, path))
+        return i, v
+
+    def set(self, buf, path, value, offset=0):
+        # bytearrays, writable memoryviews and mmaps are modified in place and
+        # returned; for bytes a modified copy is returned.
+        i, v = self.encode(path, value)
+        self._check(buf, offset)
+        if isinstance(buf, bytes):
+            return buf[:offset + i] + bytes((v,)) + buf[offset + i + 1:]
+        buf[offset + i] = v
+        return buf
+
+_INDEX = FieldIndex.for_class(AlesisV)
+
+def get_field(buf, path, offset=0):
+    return _INDEX.get(buf, path, offset)
+
+def set_field(buf, path, value, offset=0):
+    return _INDEX.set(buf, path, value, offset)
@@ -0,0 +1,99 @@
+import mmap
+
+from alesisvsysex.protocol.sysex import SysexMessage
+
+__all__ = ['SysexStreamParser', 'iter_file']
+
+class SysexStreamParser (object):
+
+    _START = b'\xf0'
+    _END = b'\xf7'
+
+    def __init__(self, max_frame=None):
+        if max_frame is None:
+            max_frame = max(SysexMessage.num_bytes(t) for t in SysexMessage._TYPES)
+        self.max_frame = max_frame
+        self.discarded = 0
+        self.errors = 0
+        self._frame = bytearray()
+        self._in_frame = False
+
+    def reset(self):
+        self._frame = bytearray()
+        self._in_frame = False
+
+    def feed(self, chunk):
+        # `chunk` may be anything supporting find() and slicing: bytes,
+        # bytearray or an mmap. Only the bytes of the current frame are ever
+        # copied, so memory use is bounded by max_frame.
+        if isinstance(chunk, memoryview):
+            chunk = chunk.tobytes()
+        i = 0
+        n = len(chunk)
+        while i < n:
+            if not self._in_frame:
+                j = chunk.find(self._START, i)
+                if j < 0:
+                    self.discarded += n - i
+                    return
+                self.discarded += j - i
+                self._frame = bytearray(self._START)
+                self._in_frame = True
+                i = j + 1
+                continue
+
+            end = chunk.find(self._END, i)
+            stop = n if end < 0 else end
+            restart = chunk.find(self._START, i, stop)
+
+            if restart >= 0:
+                # A new frame began before the current one ended
+                self.errors += 1
+                self._in_frame = False
+                i = restart
+                continue
+
+            if len(self._frame) + (stop - i) + 1 > self.max_frame:
+                self.errors += 1
+                self._in_frame = False
+                self.discarded += stop - i
+                i = stop if end < 0 else end + 1
+                continue
+
+            if end < 0:
+                self._frame += chunk[i:n]
+                return
+
+            self._frame += chunk[i:end + 1]
+            self._in_frame = False
+            i = end + 1
+            if SysexMessage.classify(self._frame) is None:
+                self.errors += 1
+                continue
+            try:
+                msg = SysexMessage.deserialize(bytes(self._frame))
+            except ValueError:
+                self.errors += 1
+                continue
+            yield msg
+
+def iter_file(filename, chunk_size=1 << 16, use_mmap=False, parser=None):
+    if parser is None:
+        parser = SysexStreamParser()
+    with open(filename, 'rb') as f:
+        if use_mmap:
+            try:
+                m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped
+                return
+            with m:
+                for msg in parser.feed(m):
+                    yield msg
+        else:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                for msg in parser.feed(chunk):
+                    yield msg
@@ -1,82 +1,137 @@
+import hashlib
+
 from .model import AlesisV
 
-__all__ = ['SysexMessage']
+__all__ = ['SysexMessage', 'read_payload', 'content_hash']
 
 class SysexMessage (object):
-    
+
     _TYPES = {
         'update': [0x61],
         'query':  [0x62],
         'reply':  [0x63]
     }
-    
+
     _HEADER_START = [0x00, 0x00, 0x0e, 0x00, 0x41]
     _HEADER_END   = [0x00, 0x5d]
-    
+
     _START_BYTE = [0xf0]
     _END_BYTE   = [0xf7]
-    
+
+    # Precomputed frame constants, see _precompute() below
+    _PREFIX = b''
+    _SUFFIX = b''
+    _TYPE_OFFSET = 0
+    _TYPE_BY_BYTE = {}
+    _FRAME_START = {}
+    _SIZES = {}
+
     def __init__(self, msg_type, model=None):
         self.type  = msg_type
         self.model = model
-    
+
     def serialize(self):
         if self.type == 'query':
-            return bytes(self._START_BYTE + self._HEADER_START + self._TYPES[self.type]
-                         + self._HEADER_END + self._END_BYTE)
+            return self._FRAME_START[self.type] + self._SUFFIX
         else:
-            return bytes(self._START_BYTE + self._HEADER_START + self._TYPES[self.type]
-                         + self._HEADER_END) + self.model.serialize() + bytes(self._END_BYTE)
-                     
-        
+            return self._FRAME_START[self.type] + self.model.serialize() + self._SUFFIX
+
+    @classmethod
+    def classify(cls, buf):
+        # Returns the message type if `buf` (bytes, bytearray or memoryview)
+        # is a complete, well-formed V25 frame, None otherwise. No model is
+        # built.
+        n = len(buf)
+        if n < cls._SIZES['query'] or buf[:cls._TYPE_OFFSET] != cls._PREFIX:
+            return None
+        msg_type = cls._TYPE_BY_BYTE.get(buf[cls._TYPE_OFFSET])
+        if (msg_type is None or n != cls._SIZES[msg_type]
+                or buf[cls._TYPE_OFFSET + 1 : cls._TYPE_OFFSET + 1 + len(cls._HEADER_END)]
+                   != cls._HEADER_END_BYTES
+                or buf[n - 1] != cls._END_BYTE[0]):
+            return None
+        return msg_type
+
+    @classmethod
+    def is_v25_frame(cls, buf):
+        return cls.classify(buf) is not None
+
+    @classmethod
+    def payload(cls, buf):
+        # The serialized AlesisV carried by an 'update' or 'reply' frame,
+        # sliced out without decoding it
+        msg_type = cls.classify(buf)
+        if msg_type is None or msg_type == 'query':
+            raise ValueError("Not a V25 configuration message")
+        return buf[len(cls._FRAME_START[msg_type]) : len(buf) - len(cls._SUFFIX)]
+
     @classmethod
     def deserialize(cls, b):
-        i = 0
-        
-        start_byte = b[i : i+1]
-        if start_byte != bytes(cls._START_BYTE):
-            raise ValueError("Invalid start byte '0x%02x'" % start_byte[0])
-        i += 1
-        
-        header_start = b[i : i + len(cls._HEADER_START)]
-        if header_start != bytes(cls._HEADER_START):
+        if len(b) < cls._SIZES['query']:
+            raise ValueError("Truncated message of %d bytes" % len(b))
+
+        if b[0:1] != cls._START:
+            raise ValueError("Invalid start byte '0x%02x'" % b[0])
+
+        if b[1:cls._TYPE_OFFSET] != cls._HEADER_START_BYTES:
             raise ValueError("Invalid message header")
-        i += len(cls._HEADER_START)
-        
-        t = b[i : i + 1]
-        for k, v in cls._TYPES.items():
-            if t == bytes(v):
-                msg_type = k
-                break
-        else:
-            raise ValueError("Unknown message type '0x%02x'" % t[0])
+        i = cls._TYPE_OFFSET
+
+        try:
+            msg_type = cls._TYPE_BY_BYTE[b[i]]
+        except KeyError:
+            raise ValueError("Unknown message type '0x%02x'" % b[i])
         i += 1
-        
-        header_end = b[i : i + len(cls._HEADER_END)]
-        if header_end != bytes(cls._HEADER_END):
+
+        if b[i : i + len(cls._HEADER_END)] != cls._HEADER_END_BYTES:
             raise ValueError("Invalid message header")
         i += len(cls._HEADER_END)
-        
+
         if msg_type == "query":
             model = None
         else:
-            model = AlesisV.deserialize(b[i : i + AlesisV.num_bytes()])
-            i += AlesisV.num_bytes()
-        
+            n = AlesisV.num_bytes()
+            model = AlesisV.deserialize(b[i : i + n])
+            i += n
+
         end_byte = b[i : i+1]
-        if end_byte != bytes(cls._END_BYTE):
+        if len(end_byte) == 0:
+            raise ValueError("Missing end byte")
+        if end_byte != cls._SUFFIX:
             raise ValueError("Invalid end byte '0x%02x'" % end_byte[0])
-        i += 1
-        
+
         return SysexMessage(msg_type, model)
-    
+
     @classmethod
     def num_bytes(cls, msg_type):
         if msg_type == 'query':
-            return (len(cls._START_BYTE) + len(cls._HEADER_START) + 1
-                    + len(cls._HEADER_END) + len(cls._END_BYTE))
+            return cls._SIZES['query']
         else:
-            return (len(cls._START_BYTE) + len(cls._HEADER_START) + 1
-                    + len(cls._HEADER_END) + AlesisV.num_bytes()
-                    + len(cls._END_BYTE))
-        
+            return cls._SIZES['update']
+
+    @classmethod
+    def _precompute(cls):
+        cls._START = bytes(cls._START_BYTE)
+        cls._HEADER_START_BYTES = bytes(cls._HEADER_START)
+        cls._HEADER_END_BYTES = bytes(cls._HEADER_END)
+        cls._PREFIX = bytes(cls._START_BYTE + cls._HEADER_START)
+        cls._SUFFIX = bytes(cls._END_BYTE)
+        cls._TYPE_OFFSET = len(cls._PREFIX)
+        cls._TYPE_BY_BYTE = {v[0]: k for k, v in cls._TYPES.items()}
+        cls._FRAME_START = {k: cls._PREFIX + bytes(v + cls._HEADER_END)
+                            for k, v in cls._TYPES.items()}
+        cls._SIZES = {k: len(v) + len(cls._SUFFIX)
+                         + (0 if k == 'query' else AlesisV.num_bytes())
+                      for k, v in cls._FRAME_START.items()}
+
+SysexMessage._precompute()
+
+def read_payload(data):
+    # A FileDevice file holds the bare payload; dumps from other tools hold
+    # a full 'update' or 'reply' frame
+    if len(data) == AlesisV.num_bytes():
+        return bytes(data)
+    return bytes(SysexMessage.payload(data))
+
+def content_hash(payload):
+    return hashlib.sha256(payload).hexdigest()
@@ -2,87 +2,135 @@ import struct
 
 __all__ = ['AbstractEnumValue', 'IntValue', 'KnobModeEnum', 'ButtonModeEnum', 'PadModeEnum']
 
+# Values are immutable and interned: constructing one returns a shared
+# instance, so decoding a preset allocates no per-byte value objects.
+
 class AbstractEnumValue (object):
 
+    __slots__ = ('_value', '_int')
+
     _VALUES = {}
 
-    def __init__(self, val):
-        if isinstance(val, int):
-            try:
-                self._value = next(k for k, v in self._VALUES.items() if v == val)
-            except StopIteration:
-                raise ValueError("Invalid value '%d' for enum '%s'"
-                                 % (val, self.__class__.__name__))
-        elif isinstance(val, str):
-            if val in self._VALUES:
-                self._value = val
-            else:
-                raise ValueError("Invalid value '%s' for enum '%s'"
-                                 % (val, self.__class__.__name__))
-        else:
+    def __new__(cls, val):
+        if not isinstance(val, (int, str)):
             raise ValueError("Enum must be instantiated with int or string.")
-        
+        instances = cls.__dict__.get('_INSTANCES')
+        if instances is None:
+            instances = cls._intern()
+        try:
+            return instances[val]
+        except KeyError:
+            if isinstance(val, int):
+                raise ValueError("Invalid value '%d' for enum '%s'"
+                                 % (val, cls.__name__))
+            raise ValueError("Invalid value '%s' for enum '%s'"
+                             % (val, cls.__name__))
+
+    @classmethod
+    def _intern(cls):
+        # One instance per member, reachable by both name and code
+        instances = {}
+        names = {}
+        for k, v in cls._VALUES.items():
+            inst = object.__new__(cls)
+            object.__setattr__(inst, '_value', k)
+            object.__setattr__(inst, '_int', v)
+            instances[k] = instances[v] = inst
+            names[v] = k
+        cls._INSTANCES = instances
+        cls._NAMES = names
+        return instances
+
+    def __setattr__(self, attr, value):
+        raise AttributeError("'%s' is immutable" % self.__class__.__name__)
+
+    def __reduce__(self):
+        return (self.__class__, (self._value,))
+
     def as_string(self):
         return self._value
-    
+
     def as_int(self):
-        return self._VALUES[self._value]
-    
+        return self._int
+
     def enum_vals(self):
         return self._VALUES.items()
-        
+
     def serialize(self):
-        return struct.pack('B', self.as_int())
-    
+        return struct.pack('B', self._int)
+
     @classmethod
     def num_bytes(cls):
         return 1
-    
+
     @classmethod
     def deserialize(cls, b):
         return cls(int(b[0]))
-    
+
 class IntValue (object):
 
-    def __init__(self, val):
+    __slots__ = ('_value',)
+
+    _INSTANCES = ()
+
+    def __new__(cls, val):
         if not isinstance(val, int):
             raise ValueError("Invalid type '%s', expected int."
                              % (val.__class__.__name__))
-        self._value = val
+        if cls is IntValue and 0 <= val < len(IntValue._INSTANCES):
+            return IntValue._INSTANCES[val]
+        inst = object.__new__(cls)
+        object.__setattr__(inst, '_value', val)
+        return inst
+
+    def __setattr__(self, attr, value):
+        raise AttributeError("'%s' is immutable" % self.__class__.__name__)
+
+    def __reduce__(self):
+        return (self.__class__, (self._value,))
 
     def as_int(self):
         return self._value
-        
+
     def serialize(self):
-        return struct.pack('B', self.as_int())
-        
+        return struct.pack('B', self._value)
+
     @classmethod
     def num_bytes(cls):
         return 1
-    
+
     @classmethod
     def deserialize(cls, b):
         return cls(int(b[0]))
 
+# Intern every byte value, not just 0x00-0x7f: the model defaults use 0xff
+# as an intentionally invalid placeholder.
+IntValue._INSTANCES = tuple(IntValue(i) for i in range(0x100))
+
 class KnobModeEnum (AbstractEnumValue):
 
+    __slots__ = ()
+
     _VALUES = {
         'CC':           0x00,
         'Aftertouch':   0x01
     }
-    
+
 class PadModeEnum (AbstractEnumValue):
-    
+
+    __slots__ = ()
+
     _VALUES = {
         'Note':         0x00,
         'Toggle CC':    0x01,
         'Momentary CC': 0x02
     }
-    
+
 class ButtonModeEnum (AbstractEnumValue):
 
+    __slots__ = ()
+
     _VALUES = {
         'Toggle CC':    0x00,
         'Momentary CC': 0x01
     }
-
@@ -0,0 +1,155 @@
+import operator
+
+from alesisvsysex.protocol.codec import StructCodec
+from alesisvsysex.protocol.model import AlesisV
+from alesisvsysex.protocol.types import AbstractEnumValue
+
+__all__ = ['Violation', 'Validator', 'validate', 'validate_bank', 'ensure_valid']
+
+# Constraint table. Every IntValue field is a MIDI data byte unless its name
+# has its own range below; enum fields must hold one of their codes. Each
+# pair names two sibling fields where the first may not exceed the second.
+
+DATA_RANGE = (0x00, 0x7f)
+
+RANGES = {
+    'channel': (0x00, 0x0f)
+}
+
+ORDERED = [
+    ('min', 'max')
+]
+
+class Violation (object):
+
+    __slots__ = ('path', 'value', 'message', 'index')
+
+    def __init__(self, path, value, message, index=None):
+        self.path = path
+        self.value = value
+        self.message = message
+        self.index = index
+
+    def __eq__(self, other):
+        return (isinstance(other, Violation)
+                and (self.path, self.value, self.message, self.index)
+                    == (other.path, other.value, other.message, other.index))
+
+    def __hash__(self):
+        return hash((self.path, self.value, self.message, self.index))
+
+    def __str__(self):
+        s = "%s = %d: %s" % (self.path, self.value, self.message)
+        if self.index is not None:
+            s = "record %d: %s" % (self.index, s)
+        return s
+
+    def __repr__(self):
+        return "<Violation %s>" % self
+
+class Validator (object):
+
+    # The constraint table compiled against the codec layout: one 256-byte
+    # lookup table per field (0 = allowed, 1 = not) and a list of ordered
+    # offset pairs. Banks are checked column by column with bytes.translate,
+    # so the per-record work happens in C.
+
+    _CACHE = {}
+
+    def __init__(self, cls):
+        codec = StructCodec.for_class(cls)
+        self.cls = cls
+        self.size = codec.size
+        self.paths = codec.paths
+        self.tables = []
+        self.messages = []
+        for path, t in zip(codec.paths, codec.types):
+            if issubclass(t, AbstractEnumValue):
+                allowed = set(t._VALUES.values())
+                message = "invalid %s code" % t.__name__
+            else:
+                lo, hi = RANGES.get(path.rsplit('.', 1)[-1], DATA_RANGE)
+                allowed = set(range(lo, hi + 1))
+                message = "expected %d-%d" % (lo, hi)
+            self.tables.append(bytes(0 if v in allowed else 1 for v in range(0x100)))
+            self.messages.append(message)
+
+        self.pairs = []
+        for lo, hi in ORDERED:
+            for path in codec.paths:
+                prefix, name = path.rpartition('.')[::2]
+                if name == lo and prefix + '.' + hi in codec.offsets:
+                    self.pairs.append((codec.offsets[path],
+                                       codec.offsets[prefix + '.' + hi]))
+
+    @classmethod
+    def for_class(cls, component_cls):
+        try:
+            return cls._CACHE[component_cls]
+        except KeyError:
+            validator = cls._CACHE[component_cls] = cls(component_cls)
+            return validator
+
+    def _pair_violation(self, lo, hi, a, b, index=None):
+        return Violation(self.paths[lo], a,
+                         "greater than %s (%d)" % (self.paths[hi], b), index)
+
+    def check(self, config):
+        # `config` is a model or its serialized form. Models are read field by
+        # field, so out-of-range ints that would not even serialize are
+        # reported too.
+        if hasattr(config, 'serialize'):
+            values = StructCodec.for_class(self.cls).values(config)
+        else:
+            if len(config) != self.size:
+                raise ValueError("Expected %d bytes, got %d." % (self.size, len(config)))
+            values = config
+        out = []
+        for i, (table, v) in enumerate(zip(self.tables, values)):
+            if not 0 <= v <= 0xff or table[v]:
+                out.append(Violation(self.paths[i], v, self.messages[i]))
+        for lo, hi in self.pairs:
+            if values[lo] > values[hi]:
+                out.append(self._pair_violation(lo, hi, values[lo], values[hi]))
+        return out
+
+    def check_bank(self, records):
+        # `records` is one buffer of consecutive serialized records, or an
+        # iterable of models or records. Violations carry the record index
+        # and are ordered by field, then record.
+        if not isinstance(records, (bytes, bytearray, memoryview)):
+            records = b''.join(r.serialize() if hasattr(r, 'serialize') else r
+                               for r in records)
+        buf = bytes(records)
+        n = self.size
+        if len(buf) % n:
+            raise ValueError("Bank size %d is not a multiple of the record size %d."
+                             % (len(buf), n))
+        out = []
+        for i, table in enumerate(self.tables):
+            col = buf[i::n]
+            bad = col.translate(table)
+            j = bad.find(1)
+            while j >= 0:
+                out.append(Violation(self.paths[i], col[j], self.messages[i], j))
+                j = bad.find(1, j + 1)
+        for lo, hi in self.pairs:
+            a = buf[lo::n]
+            b = buf[hi::n]
+            bad = bytes(map(operator.gt, a, b))
+            j = bad.find(1)
+            while j >= 0:
+                out.append(self._pair_violation(lo, hi, a[j], b[j], j))
+                j = bad.find(1, j + 1)
+        return out
+
+def validate(config, cls=AlesisV):
+    return Validator.for_class(cls).check(config)
+
+def validate_bank(records, cls=AlesisV):
+    return Validator.for_class(cls).check_bank(records)
+
+def ensure_valid(config, cls=AlesisV):
+    violations = validate(config, cls)
+    if violations:
+        raise ValueError("Invalid configuration: %s" % '; '.join(map(str, violations)))
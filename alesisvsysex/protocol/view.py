@@ -0,0 +1,102 @@
+from alesisvsysex.protocol.model import AlesisV
+
+__all__ = ['ComponentView', 'view_class', 'AlesisVView']
+
+class ComponentView (object):
+
+    __slots__ = ('_buf', '_base')
+
+    _COMPONENT = None
+    _SIZE = 0
+    _CLASSES = {}
+
+    def __init__(self, buf=None, offset=0):
+        if buf is None:
+            buf = bytearray(self._COMPONENT().serialize())
+        if len(buf) < offset + self._SIZE:
+            raise ValueError("Expected %d bytes for '%s' at offset %d, got %d."
+                             % (self._SIZE, self._COMPONENT.__name__, offset,
+                                len(buf)))
+        self._buf = buf
+        self._base = offset
+
+    def serialize(self):
+        if self._base == 0 and len(self._buf) == self._SIZE:
+            return bytes(self._buf)
+        return bytes(self._buf[self._base : self._base + self._SIZE])
+
+    def copy(self):
+        return self.__class__(bytearray(self.serialize()))
+
+    def to_model(self):
+        return self._COMPONENT.deserialize(self.serialize())
+
+    @classmethod
+    def from_model(cls, model):
+        if not isinstance(model, cls._COMPONENT):
+            raise ValueError("Got type '%s', expected a '%s'."
+                             % (model.__class__.__name__, cls._COMPONENT.__name__))
+        return cls(bytearray(model.serialize()))
+
+    @classmethod
+    def num_bytes(cls):
+        return cls._SIZE
+
+    @classmethod
+    def deserialize(cls, b):
+        return cls(b)
+
+    @classmethod
+    def iter_bank(cls, buf):
+        for offset in range(0, len(buf) - cls._SIZE + 1, cls._SIZE):
+            yield cls(buf, offset)
+
+def _leaf_property(name, value_cls, offset):
+
+    def fget(self):
+        return value_cls(self._buf[self._base + offset])
+
+    def fset(self, v):
+        if not isinstance(v, value_cls):
+            raise ValueError("Invalid type '%s' for field '%s' - expected '%s'."
+                             % (v.__class__.__name__, name, value_cls.__name__))
+        self._buf[self._base + offset] = v.as_int()
+
+    return property(fget, fset)
+
+def _view_property(view_cls, offset):
+
+    def fget(self):
+        return view_cls(self._buf, self._base + offset)
+
+    return property(fget)
+
+def view_class(component_cls):
+    try:
+        return ComponentView._CLASSES[component_cls]
+    except KeyError:
+        pass
+
+    if hasattr(component_cls, '_COMPONENTS'):
+        children = [(k, c) for k, c, _ in component_cls._COMPONENTS]
+    else:
+        children = [(k, c) for k, c, _ in component_cls._PARAMS]
+
+    ns = {
+        '__slots__': (),
+        '_COMPONENT': component_cls,
+        '_SIZE': component_cls.num_bytes()
+    }
+    offset = 0
+    for k, c in children:
+        if hasattr(c, '_COMPONENTS') or hasattr(c, '_PARAMS'):
+            ns[k] = _view_property(view_class(c), offset)
+        else:
+            ns[k] = _leaf_property(k, c, offset)
+        offset += c.num_bytes()
+
+    cls = type(component_cls.__name__ + 'View', (ComponentView,), ns)
+    ComponentView._CLASSES[component_cls] = cls
+    return cls
+
+AlesisVView = view_class(AlesisV)
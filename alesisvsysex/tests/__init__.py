@@ -1,3 +1,6 @@
 import alesisvsysex.tests.protocol
 import alesisvsysex.tests.device
-
+import alesisvsysex.tests.library
+import alesisvsysex.tests.ui
+import alesisvsysex.tests.test_cli
+import alesisvsysex.tests.test_imports
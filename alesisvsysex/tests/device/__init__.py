@@ -1,2 +1,8 @@
 import alesisvsysex.tests.device.test_alesis
-
+import alesisvsysex.tests.device.test_file
+import alesisvsysex.tests.device.test_aio
+import alesisvsysex.tests.device.test_fleet
+import alesisvsysex.tests.device.test_cache
+import alesisvsysex.tests.device.test_emulator
+import alesisvsysex.tests.device.test_metrics
+import alesisvsysex.tests.device.test_store
@@ -0,0 +1,68 @@
+import asyncio
+import threading
+
+import mido
+
+from alesisvsysex.device.aio import *
+from alesisvsysex.protocol.model import *
+from alesisvsysex.protocol.sysex import *
+from alesisvsysex.protocol.types import *
+
+class FakePort (object):
+
+    def __init__(self, respond=True):
+        self.callback = None
+        self.respond = respond
+        self.model = AlesisV()
+
+    def send(self, msg):
+        m = SysexMessage.deserialize(msg.bin())
+        if m.type == 'update':
+            self.model = m.model
+        elif m.type == 'query' and self.respond:
+            reply = mido.Message.from_bytes(SysexMessage('reply', self.model).serialize())
+            noise = mido.Message('note_on')
+            def deliver():
+                self.callback(noise)
+                self.callback(reply)
+            threading.Thread(target=deliver).start()
+
+    def close(self):
+        pass
+
+def test_aio_get_config():
+    port = FakePort()
+    port.model.knobs.knob1.cc = IntValue(0x44)
+    d = AsyncAlesisV25Device(port)
+    m = asyncio.run(d.get_config())
+    assert m.knobs.knob1.cc.as_int() == 0x44
+    assert d.discarded == 1
+
+def test_aio_set_config():
+    port = FakePort()
+    d = AsyncAlesisV25Device(port)
+    m = AlesisV()
+    m.pads.pad1.note = IntValue(0x30)
+    asyncio.run(d.set_config(m))
+    assert port.model.pads.pad1.note.as_int() == 0x30
+
+def test_aio_timeout():
+    d = AsyncAlesisV25Device(FakePort(respond=False))
+    try:
+        asyncio.run(d.get_config(timeout=0.05))
+        assert False
+    except asyncio.TimeoutError:
+        assert True
+
+def test_aio_cancel():
+    d = AsyncAlesisV25Device(FakePort(respond=False), timeout=10)
+    async def run():
+        task = asyncio.ensure_future(d.get_config())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        try:
+            await task
+            return False
+        except asyncio.CancelledError:
+            return not d._lock.locked()
+    assert asyncio.run(run())
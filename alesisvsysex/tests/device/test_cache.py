@@ -0,0 +1,68 @@
+import time
+
+from alesisvsysex.device.cache import *
+from alesisvsysex.protocol.model import *
+from alesisvsysex.protocol.types import *
+
+class FakeDevice (object):
+
+    def __init__(self):
+        self.model = AlesisV()
+        self.queries = 0
+        self.pending = []
+
+    def drain(self):
+        p, self.pending = self.pending, []
+        return p
+
+    def get_config(self):
+        self.queries += 1
+        return AlesisV.deserialize(self.model.serialize())
+
+    def set_config(self, model, verify=True):
+        self.model = model
+
+def test_cache_hit():
+    d = FakeDevice()
+    c = CachedDevice(d)
+    c.get_config()
+    m = c.get_config()
+    assert d.queries == 1
+    assert c.hits == 1 and c.misses == 1
+    m.keys.octave = IntValue(0x05)
+    assert c.get_config().keys.octave.as_int() == 0x02
+
+def test_cache_force():
+    d = FakeDevice()
+    c = CachedDevice(d)
+    c.get_config()
+    c.get_config(force=True)
+    assert d.queries == 2
+
+def test_cache_ttl():
+    d = FakeDevice()
+    c = CachedDevice(d, ttl=0.01)
+    c.get_config()
+    time.sleep(0.02)
+    c.get_config()
+    assert d.queries == 2
+
+def test_cache_write():
+    d = FakeDevice()
+    c = CachedDevice(d)
+    m = AlesisV()
+    m.keys.channel = IntValue(0x03)
+    c.set_config(m)
+    assert c.get_config().keys.channel.as_int() == 0x03
+    assert d.queries == 0
+    c.set_config(AlesisV(), verify=False)
+    assert c.get_config().keys.channel.as_int() == 0x00
+    assert d.queries == 1
+
+def test_cache_unsolicited():
+    d = FakeDevice()
+    c = CachedDevice(d)
+    c.get_config()
+    d.pending.append(object())
+    c.get_config()
+    assert d.queries == 2
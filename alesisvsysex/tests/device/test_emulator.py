@@ -0,0 +1,80 @@
+import asyncio
+import time
+
+import mido
+
+from alesisvsysex.device.alesis import *
+from alesisvsysex.device.aio import *
+from alesisvsysex.device.emulator import *
+from alesisvsysex.protocol.model import *
+from alesisvsysex.protocol.types import *
+
+def test_emulator_get_config():
+    m = AlesisV()
+    m.knobs.knob3.cc = IntValue(0x10)
+    d = AlesisV25Device(EmulatedV25Port(m))
+    assert d.get_config().knobs.knob3.cc.as_int() == 0x10
+
+def test_emulator_set_config():
+    port = EmulatedV25Port()
+    d = AlesisV25Device(port)
+    m = AlesisV()
+    m.buttons.button4.mode = ButtonModeEnum('Momentary CC')
+    d.set_config(m)
+    assert port.model.serialize() == m.serialize()
+
+def test_emulator_set_config_invalid():
+    port = EmulatedV25Port()
+    d = AlesisV25Device(port)
+    m = AlesisV()
+    m.pads.pad1.channel = IntValue(0x10)
+    try:
+        d.set_config(m, check=True)
+        assert False
+    except ValueError:
+        assert port.received == 0
+    d.set_config(m, verify=False)
+    assert port.received == 1
+
+def test_emulator_latency():
+    d = AlesisV25Device(EmulatedV25Port(latency=0.05))
+    start = time.monotonic()
+    d.get_config()
+    assert time.monotonic() - start >= 0.05
+
+def test_emulator_late_reply():
+    port = EmulatedV25Port(latency=0.2)
+    d = AlesisV25Device(port)
+    try:
+        d.get_config(timeout=0.05)
+        assert False
+    except TimeoutError:
+        pass
+    m = AlesisV()
+    m.knobs.knob2.cc = IntValue(0x22)
+    d.set_config(m, timeout=1)
+    assert d.get_config(timeout=1).serialize() == m.serialize()
+    assert d.stats()['discarded'] == 1
+
+def test_emulator_drop():
+    port = EmulatedV25Port(drop_rate=1.0)
+    d = AlesisV25Device(port)
+    try:
+        d.get_config(timeout=0.05)
+        assert False
+    except TimeoutError:
+        assert port.dropped == 1
+
+def test_emulator_skips_non_sysex():
+    port = EmulatedV25Port()
+    port.inject(mido.Message('note_on', note=60))
+    d = AlesisV25Device(port)
+    assert isinstance(d.get_config(timeout=1), AlesisV)
+
+def test_emulator_async():
+    port = EmulatedV25Port(latency=0.01, jitter=0.01, seed=1)
+    d = AsyncAlesisV25Device(port)
+    m = AlesisV()
+    m.sustain.cc = IntValue(0x41)
+    asyncio.run(d.set_config(m))
+    assert port.model.sustain.cc.as_int() == 0x41
@@ -0,0 +1,133 @@
+import os
+import tempfile
+
+from alesisvsysex.device.file import *
+from alesisvsysex.protocol.model import *
+from alesisvsysex.protocol.types import *
+
+def test_file_roundtrip():
+    with tempfile.TemporaryDirectory() as d:
+        f = FileDevice(os.path.join(d, 'a.syx'))
+        m = AlesisV()
+        m.keys.octave = IntValue(0x03)
+        f.set_config(m)
+        assert f.get_config().keys.octave.as_int() == 0x03
+
+def test_bank_create():
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, 'bank.avb')
+        with BankFileDevice.create(path, 4) as b:
+            assert len(b) == 4
+            assert b.read(3) == AlesisV().serialize()
+            assert b.name(0) == ''
+        assert os.path.getsize(path) == 16 + 4 * 32 + 4 * AlesisV.num_bytes()
+
+def test_bank_read_write():
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, 'bank.avb')
+        m = AlesisV()
+        m.pads.pad2.channel = IntValue(0x02)
+        with BankFileDevice.create(path, 8) as b:
+            b.set_model(5, m, 'drums')
+        with BankFileDevice(path, slot=5) as b:
+            assert b.get_config().pads.pad2.channel.as_int() == 0x02
+            assert b.find('drums') == 5
+            assert b.get_model(4).pads.pad2.channel.as_int() == 0x09
+
+def test_bank_view():
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, 'bank.avb')
+        b = BankFileDevice.create(path, 2)
+        v = b.view(1)
+        v.keys.channel = IntValue(0x05)
+        del v
+        assert b.get_model(1).keys.channel.as_int() == 0x05
+        assert b.get_model(0).keys.channel.as_int() == 0x00
+        b.close()
+
+def test_bank_bad_slot():
+    with tempfile.TemporaryDirectory() as d:
+        with BankFileDevice.create(os.path.join(d, 'bank.avb'), 2) as b:
+            try:
+                b.read(2)
+                assert False
+            except IndexError:
+                assert True
+
+def test_bank_bad_file():
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, 'a.syx')
+        FileDevice(path).set_config(AlesisV())
+        try:
+            BankFileDevice(path)
+            assert False
+        except ValueError:
+            assert True
+
+def test_bank_import_export():
+    with tempfile.TemporaryDirectory() as d:
+        paths = []
+        for i in range(3):
+            m = AlesisV()
+            m.keys.curve = IntValue(i)
+            paths.append(os.path.join(d, 'p%d.syx' % i))
+            FileDevice(paths[-1]).set_config(m)
+        with BankFileDevice.from_files(os.path.join(d, 'bank.avb'), paths) as b:
+            assert b.find('p2') == 2
+            out = os.path.join(d, 'out')
+            os.mkdir(out)
+            exported = b.export_files(out)
+        assert [os.path.basename(p) for p in exported] == ['p0.syx', 'p1.syx', 'p2.syx']
+        assert FileDevice(exported[1]).get_config().keys.curve.as_int() == 1
+
+def test_bank_export_names():
+    with tempfile.TemporaryDirectory() as d:
+        out = os.path.join(d, 'out')
+        os.mkdir(out)
+        with BankFileDevice.create(os.path.join(d, 'bank.avb'), 3) as bank:
+            for name in ('../escaped', 'a/b'):
+                try:
+                    bank.set_name(2, name)
+                    assert False
+                except ValueError:
+                    pass
+            bank.set_name(0, 'same')
+            bank.set_name(1, 'same')
+            try:
+                bank.export_files(out)
+                assert False
+            except ValueError:
+                pass
+            assert os.listdir(out) == []
+        assert sorted(os.listdir(d)) == ['bank.avb', 'out']
+
+def test_bank_long_names():
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, 'x' * 40 + '.syx')
+        FileDevice(path).set_config(AlesisV())
+        with BankFileDevice.from_files(os.path.join(d, 'bank.avb'), [path]) as bank:
+            assert bank.name(0) == 'x' * 32
+        with BankFileDevice.create(os.path.join(d, 'b2.avb'), 1) as bank:
+            m = AlesisV()
+            m.keys.octave = IntValue(0x04)
+            try:
+                bank.set_model(0, m, 'y' * 33)
+                assert False
+            except ValueError:
+                pass
+            assert bank.read(0) == AlesisV().serialize()
+
+def test_bank_import_bad_file():
+    with tempfile.TemporaryDirectory() as d:
+        good = os.path.join(d, 'good.syx')
+        FileDevice(good).set_config(AlesisV())
+        bad = os.path.join(d, 'bad.syx')
+        with open(bad, 'wb') as f:
+            f.write(b'\x00')
+        with BankFileDevice.create(os.path.join(d, 'bank.avb'), 2) as bank:
+            try:
+                bank.import_files([good, bad])
+                assert False
+            except ValueError:
+                pass
+            assert bank.name(0) == ''
@@ -0,0 +1,69 @@
+import time
+
+from alesisvsysex.device.fleet import *
+from alesisvsysex.protocol.model import *
+from alesisvsysex.protocol.types import *
+from alesisvsysex.protocol.validate import ensure_valid
+
+class FakeDevice (object):
+
+    def __init__(self, delay=0.1, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.model = AlesisV()
+
+    def get_config(self, timeout=None):
+        time.sleep(self.delay)
+        return self.model
+
+    def set_config(self, model, timeout=None, verify=True, check=False):
+        time.sleep(self.delay)
+        if check:
+            ensure_valid(model)
+        if self.fail:
+            raise RuntimeError('Failed to update configuration')
+        self.model = model
+
+def test_fleet_push_parallel():
+    devices = {'a': FakeDevice(), 'b': FakeDevice(), 'c': FakeDevice()}
+    f = AlesisV25Fleet(devices)
+    m = AlesisV()
+    m.keys.channel = IntValue(0x02)
+    start = time.perf_counter()
+    results = f.push(m)
+    assert time.perf_counter() - start < 0.25
+    assert all(r.ok for r in results.values())
+    assert all(d.model is m for d in devices.values())
+
+def test_fleet_push_mapping():
+    devices = {'a': FakeDevice(0), 'b': FakeDevice(0, fail=True)}
+    f = AlesisV25Fleet(devices)
+    results = f.push({'a': AlesisV(), 'b': AlesisV()})
+    assert results['a'].ok
+    assert not results['b'].ok
+    assert isinstance(results['b'].error, RuntimeError)
+
+def test_fleet_push_check():
+    devices = {'a': FakeDevice(0), 'b': FakeDevice(0)}
+    m = AlesisV()
+    m.keys.channel = IntValue(0x10)
+    results = AlesisV25Fleet(devices).push(m, check=True)
+    assert not any(r.ok for r in results.values())
+    assert isinstance(results['a'].error, ValueError)
+    assert devices['a'].model is not m
+    assert all(r.ok for r in AlesisV25Fleet(devices).push(m).values())
+
+def test_fleet_push_unknown():
+    f = AlesisV25Fleet({'a': FakeDevice(0)})
+    try:
+        f.push({'x': AlesisV()})
+        assert False
+    except ValueError:
+        assert True
+
+def test_fleet_pull():
+    devices = {'a': FakeDevice(0), 'b': FakeDevice(0)}
+    devices['b'].model.keys.curve = IntValue(0x01)
+    results = AlesisV25Fleet(devices).pull()
+    assert results['b'].model.keys.curve.as_int() == 0x01
+    assert results['a'].elapsed >= 0
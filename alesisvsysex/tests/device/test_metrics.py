@@ -0,0 +1,53 @@
+import time
+
+import mido
+
+from alesisvsysex.device.alesis import *
+from alesisvsysex.device.emulator import *
+from alesisvsysex.device.metrics import *
+from alesisvsysex.protocol.model import *
+from alesisvsysex.protocol.sysex import *
+
+def test_histogram():
+    h = LatencyHistogram()
+    for s in (0.0005, 0.003, 0.003, 0.3):
+        h.observe(s)
+    snap = h.snapshot()
+    assert snap['count'] == 4
+    assert snap['min'] == 0.0005 and snap['max'] == 0.3
+    assert snap['p50'] == 0.005
+    assert snap['p99'] == 0.3
+    assert sum(n for _, n in snap['buckets']) == 4
+
+def test_device_stats():
+    port = EmulatedV25Port()
+    port.inject(mido.Message('note_on', note=60))
+    d = AlesisV25Device(port)
+    d.set_config(AlesisV())
+    s = d.stats()
+    assert s['messages_sent'] == 2
+    assert s['messages_received'] == 1
+    assert s['bytes_sent'] == SysexMessage.num_bytes('update') + SysexMessage.num_bytes('query')
+    assert s['bytes_received'] == SysexMessage.num_bytes('reply')
+    assert s['discarded'] == 1
+    assert s['get_config']['count'] == 1
+    assert s['set_config']['count'] == 1
+
+def test_device_stats_timeout():
+    d = AlesisV25Device(EmulatedV25Port(drop_rate=1.0))
+    try:
+        d.get_config(timeout=0.01)
+    except TimeoutError:
+        pass
+    assert d.stats()['timeouts'] == 1
+    d.reset_stats()
+    assert d.stats()['timeouts'] == 0
+
+def test_reporter():
+    d = AlesisV25Device(EmulatedV25Port())
+    snaps = []
+    r = d.start_reporter(0.01, snaps.append)
+    d.get_config()
+    time.sleep(0.05)
+    r.stop()
+    assert snaps and snaps[-1]['get_config']['count'] == 1
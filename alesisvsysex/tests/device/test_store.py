@@ -0,0 +1,81 @@
+import os
+import tempfile
+
+from alesisvsysex.device.file import FileDevice
+from alesisvsysex.device.store import *
+from alesisvsysex.protocol.model import *
+from alesisvsysex.protocol.sysex import SysexMessage, content_hash
+from alesisvsysex.protocol.types import *
+
+def make_model():
+    m = AlesisV()
+    m.pads.pad3.note = IntValue(0x40)
+    return m
+
+def test_store_dedup():
+    with tempfile.TemporaryDirectory() as d:
+        s = PresetStore(d)
+        h1 = s.save('a', AlesisV())
+        h2 = s.save('b', AlesisV().serialize())
+        h3 = s.save('c', SysexMessage('reply', make_model()).serialize())
+        assert h1 == h2 == content_hash(AlesisV().serialize())
+        assert h3 != h1
+        assert len(s) == 2
+        assert s.refs() == {'a': h1, 'b': h1, 'c': h3}
+        assert s.load('c').pads.pad3.note.as_int() == 0x40
+
+def test_store_persistence():
+    with tempfile.TemporaryDirectory() as d:
+        h = PresetStore(d).save('a', make_model())
+        s = PresetStore(d)
+        assert s.resolve('a') == h
+        assert s.read(h) == make_model().serialize()
+        s.remove_ref('a')
+        assert PresetStore(d).refs() == {}
+        try:
+            s.load('a')
+            assert False
+        except KeyError:
+            pass
+
+def test_store_cache():
+    with tempfile.TemporaryDirectory() as d:
+        s = PresetStore(d, cache_size=1)
+        h = s.save('a', make_model())
+        m1 = s.get(h)
+        m2 = s.get(h)
+        assert (s.misses, s.hits) == (1, 1)
+        assert m1 is not m2
+        m1.pads.pad3.note = IntValue(0x00)
+        assert s.get(h).pads.pad3.note.as_int() == 0x40
+        assert s.get(h, copy=False) is s.get(h, copy=False)
+        s.get(s.save('b', AlesisV()))
+        s.get(h)
+        assert s.misses == 3
+
+def test_store_import_and_gc():
+    with tempfile.TemporaryDirectory() as d:
+        paths = []
+        for i, m in enumerate([AlesisV(), AlesisV(), make_model()]):
+            paths.append(os.path.join(d, 'p%d.syx' % i))
+            FileDevice(paths[-1]).set_config(m)
+        s = PresetStore(os.path.join(d, 'store'))
+        try:
+            s.import_files(paths, ['a', 'b'])
+            assert False
+        except ValueError:
+            assert s.refs() == {}
+        added = s.import_files(p for p in paths)
+        assert sorted(added) == ['p0.syx', 'p1.syx', 'p2.syx']
+        assert len(s) == 2
+        s.remove_ref('p2.syx')
+        assert s.gc() == 1
+        assert len(s) == 1
+
+def test_store_devices():
+    with tempfile.TemporaryDirectory() as d:
+        s = PresetStore(os.path.join(d, 'store'))
+        dev = StoreDevice(s, 'current')
+        dev.set_config(make_model())
+        assert dev.get_config().serialize() == make_model().serialize()
+
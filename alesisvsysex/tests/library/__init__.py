@@ -0,0 +1,3 @@
+# test_array needs numpy and is collected by pytest directly.
+import alesisvsysex.tests.library.test_catalog
+import alesisvsysex.tests.library.test_convert
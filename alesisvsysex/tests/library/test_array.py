@@ -0,0 +1,84 @@
+import os
+import tempfile
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from alesisvsysex.library.array import *
+from alesisvsysex.protocol.model import *
+from alesisvsysex.protocol.types import *
+
+def make_models():
+    a = AlesisV()
+    b = AlesisV()
+    b.pads.pad2.note = IntValue(0x24)
+    b.knobs.knob1.cc = IntValue(0x4a)
+    b.knobs.knob1.channel = IntValue(0x01)
+    return [a, b]
+
+def test_dtype_layout():
+    dt = model_dtype()
+    assert dt.itemsize == AlesisV.num_bytes()
+    assert dt.names[0] == 'keys.base_note'
+
+def test_bank_roundtrip():
+    models = make_models()
+    bank = PresetBank.from_models(models)
+    assert len(bank) == 2
+    assert bank.to_bytes() == b''.join(m.serialize() for m in models)
+    assert bank.to_model(1).pads.pad2.note.as_int() == 0x24
+    assert bank.to_bytes(-1) == models[1].serialize()
+    with pytest.raises(IndexError):
+        bank.to_bytes(2)
+    with pytest.raises(IndexError):
+        bank.to_bytes(-3)
+
+def test_bank_match():
+    bank = PresetBank.from_models(make_models())
+    mask = bank.match({'knobs.knob1.cc': 0x4a, 'knobs.knob1.channel': 0x01})
+    assert list(mask) == [False, True]
+    assert list(bank.match_any('pads.*.note', 0x24)) == [True, True]
+    assert list(bank.match_any('pads.pad[1-4].note', 0x24)) == [False, True]
+
+def test_bank_set_and_validate():
+    bank = PresetBank.from_models(make_models())
+    assert bank.validate().all()
+    bank.set('pads.pad1.mode', 'Toggle CC', bank.match({'pads.pad2.note': 0x24}))
+    assert bank.to_model(1).pads.pad1.mode.as_string() == 'Toggle CC'
+    assert bank.to_model(0).pads.pad1.mode.as_string() == 'Note'
+    bank.set('keys.channel', 0x80)
+    assert not bank.validate().any()
+
+def test_bank_violations():
+    bank = PresetBank.from_models(make_models())
+    bank.set('mwheel.min', 0x7f, bank.match({'pads.pad2.note': 0x24}))
+    bank.set('mwheel.max', 0x10, bank.match({'pads.pad2.note': 0x24}))
+    assert list(bank.validate()) == [True, False]
+    assert [(v.path, v.index) for v in bank.violations()] == [('mwheel.min', 1)]
+
+def test_bank_set_bad_enum():
+    bank = PresetBank.from_models(make_models())
+    with pytest.raises(ValueError):
+        bank.set('pads.pad1.mode', 'Aftertouch')
+
+def test_bank_load_save():
+    models = make_models()
+    with tempfile.TemporaryDirectory() as d:
+        for i, m in enumerate(models):
+            with open(os.path.join(d, 'p%d.syx' % i), 'wb') as f:
+                f.write(m.serialize())
+        bank = PresetBank.load(d)
+        assert [os.path.basename(n) for n in bank.names] == ['p0.syx', 'p1.syx']
+        sub = bank.filter(bank.match({'pads.pad2.note': 0x24}))
+        assert len(sub) == 1
+        with tempfile.TemporaryDirectory() as out:
+            sub.save(out)
+            assert os.listdir(out) == ['p1.syx']
+
+def test_bank_save_duplicate_names():
+    bank = PresetBank.from_models(make_models(), ['a/p.syx', 'b/p.syx'])
+    with tempfile.TemporaryDirectory() as out:
+        with pytest.raises(ValueError):
+            bank.save(out)
+        assert os.listdir(out) == []
@@ -0,0 +1,92 @@
+import os
+import tempfile
+
+from alesisvsysex.device.file import FileDevice
+from alesisvsysex.library.catalog import *
+from alesisvsysex.protocol.model import *
+from alesisvsysex.protocol.sysex import SysexMessage
+from alesisvsysex.protocol.types import *
+
+def make_models():
+    a = AlesisV()
+    b = AlesisV()
+    b.knobs.knob2.cc = IntValue(74)
+    b.knobs.knob2.channel = IntValue(2)
+    b.pads.pad6.note = IntValue(0x24)
+    b.pads.pad6.mode = PadModeEnum('Toggle CC')
+    return a, b
+
+def write_files(d):
+    a, b = make_models()
+    FileDevice(os.path.join(d, 'a.syx')).set_config(a)
+    FileDevice(os.path.join(d, 'copy.syx')).set_config(a)
+    os.mkdir(os.path.join(d, 'sub'))
+    with open(os.path.join(d, 'sub', 'b.syx'), 'wb') as f:
+        f.write(SysexMessage('reply', b).serialize())
+    with open(os.path.join(d, 'bad.syx'), 'wb') as f:
+        f.write(b'\x00\x01')
+
+def test_catalog_scan_and_find():
+    with tempfile.TemporaryDirectory() as d:
+        write_files(d)
+        c = PresetCatalog()
+        report = c.scan(d)
+        assert (report.added, report.unchanged, len(report.errors)) == (3, 0, 1)
+        assert len(c) == 3
+        b = os.path.join(os.path.abspath(d), 'sub', 'b.syx')
+        assert c.find('*.cc', 74, channel=2) == [b]
+        assert c.find('*.cc', 74, channel=0) == []
+        # pad5 defaults to note 0x24 as well
+        assert len(c.find('pads.*.note', 36)) == 3
+        assert c.find('pads.pad6.mode', 'Toggle CC') == [b]
+        assert c.match([('pads.*.note', 36), ('knobs.*.cc', 74, 2)]) == [b]
+        assert c.get(b).knobs.knob2.cc.as_int() == 74
+        assert len(c.duplicates()) == 1
+
+def test_catalog_scan_file():
+    with tempfile.TemporaryDirectory() as d:
+        write_files(d)
+        c = PresetCatalog()
+        report = c.scan(os.path.join(d, 'a.syx'))
+        assert (report.added, report.removed) == (1, 0)
+        assert c.paths() == [os.path.join(os.path.abspath(d), 'a.syx')]
+        try:
+            c.scan(os.path.join(d, 'missing'))
+            assert False
+        except ValueError:
+            pass
+
+def test_catalog_rescan():
+    with tempfile.TemporaryDirectory() as d:
+        write_files(d)
+        c = PresetCatalog(os.path.join(d, 'catalog.db'))
+        c.scan(d)
+        report = c.scan(d)
+        assert (report.added, report.updated, report.unchanged) == (0, 0, 3)
+
+        a, b = make_models()
+        path = os.path.join(d, 'a.syx')
+        FileDevice(path).set_config(b)
+        os.utime(path, (1, 1))
+        os.remove(os.path.join(d, 'copy.syx'))
+        report = c.scan(d)
+        assert (report.updated, report.unchanged, report.removed) == (1, 1, 1)
+        assert len(c.find('*.cc', 74, 2)) == 2
+        assert c.duplicates() != []
+        c.close()
+
+def test_catalog_add_and_remove():
+    c = PresetCatalog()
+    a, b = make_models()
+    assert c.add('midi:V25', b)
+    assert not c.add('midi:V25', a)
+    assert c.find('*.cc', 74) == []
+    c.add('dump', SysexMessage('update', b).serialize())
+    assert c.find('*.cc', 74) == ['dump']
+    c.remove('dump')
+    assert 'dump' not in c
+    try:
+        c.find('nothing.*', 1)
+        assert False
+    except ValueError:
+        pass
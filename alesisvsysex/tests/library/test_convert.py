@@ -0,0 +1,77 @@
+import json
+import os
+import tempfile
+
+from alesisvsysex.device.file import FileDevice
+from alesisvsysex.library.convert import *
+from alesisvsysex.protocol.model import *
+from alesisvsysex.protocol.sysex import SysexMessage
+from alesisvsysex.protocol.types import *
+
+def make_tree(d):
+    m = AlesisV()
+    m.knobs.knob1.cc = IntValue(0x4a)
+    src = os.path.join(d, 'src')
+    os.makedirs(os.path.join(src, 'sub'))
+    FileDevice(os.path.join(src, 'a.syx')).set_config(m)
+    with open(os.path.join(src, 'sub', 'b.syx'), 'wb') as f:
+        f.write(SysexMessage('reply', m).serialize())
+    with open(os.path.join(src, 'bad.syx'), 'wb') as f:
+        f.write(b'\xf0\x00\xf7')
+    with open(os.path.join(src, 'notes.txt'), 'w') as f:
+        f.write('ignored')
+    return src, m
+
+def test_decode_formats():
+    m = AlesisV()
+    m.pads.pad1.mode = PadModeEnum('Toggle CC')
+    for fmt in FORMATS:
+        assert decode(encode(m, fmt)).serialize() == m.serialize()
+    try:
+        decode(SysexMessage('query').serialize())
+        assert False
+    except ValueError:
+        pass
+
+def test_convert_file():
+    with tempfile.TemporaryDirectory() as d:
+        src, m = make_tree(d)
+        r = convert_file(os.path.join(src, 'a.syx'), os.path.join(d, 'a.json'), 'json')
+        assert r.ok and r.size == AlesisV.num_bytes()
+        with open(os.path.join(d, 'a.json')) as f:
+            assert json.load(f)['knobs.knob1.cc'] == 0x4a
+        r = convert_file(os.path.join(src, 'bad.syx'), os.path.join(d, 'x.syx'), 'raw')
+        assert not r.ok
+
+def check_tree(src, out, m, workers):
+    report = convert_files([src], out, 'update', workers=workers, chunk_size=1)
+    assert len(report.results) == 3
+    assert [os.path.basename(r.source) for r in report.failed] == ['bad.syx']
+    for name in ['a.syx', os.path.join('sub', 'b.syx')]:
+        with open(os.path.join(out, name), 'rb') as f:
+            msg = SysexMessage.deserialize(f.read())
+        assert msg.type == 'update'
+        assert msg.model.serialize() == m.serialize()
+
+def test_convert_files_inline():
+    with tempfile.TemporaryDirectory() as d:
+        src, m = make_tree(d)
+        check_tree(src, os.path.join(d, 'out'), m, 1)
+
+def test_convert_files_pool():
+    with tempfile.TemporaryDirectory() as d:
+        src, m = make_tree(d)
+        check_tree(src, os.path.join(d, 'out'), m, 2)
+
+def test_convert_files_collision():
+    with tempfile.TemporaryDirectory() as d:
+        src, m = make_tree(d)
+        with open(os.path.join(src, 'a.json'), 'wb') as f:
+            f.write(encode(m, 'json'))
+        out = os.path.join(d, 'out')
+        report = convert_files([src], out, 'update', workers=1)
+        assert len(report.results) == 4
+        assert sorted(os.path.basename(r.source) for r in report.failed) == \
+            ['a.json', 'a.syx', 'bad.syx']
+        assert not os.path.exists(os.path.join(out, 'a.syx'))
+        assert os.path.exists(os.path.join(out, 'sub', 'b.syx'))
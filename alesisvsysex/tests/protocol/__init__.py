@@ -1,4 +1,9 @@
 import alesisvsysex.tests.protocol.test_types
 import alesisvsysex.tests.protocol.test_model
+import alesisvsysex.tests.protocol.test_codec
+import alesisvsysex.tests.protocol.test_view
 import alesisvsysex.tests.protocol.test_sysex
-
+import alesisvsysex.tests.protocol.test_stream
+import alesisvsysex.tests.protocol.test_diff
+import alesisvsysex.tests.protocol.test_fields
+import alesisvsysex.tests.protocol.test_validate
@@ -0,0 +1,70 @@
+from alesisvsysex.protocol.codec import *
+from alesisvsysex.protocol.component import CompoundComponent
+from alesisvsysex.protocol.model import *
+from alesisvsysex.protocol.types import *
+
+def test_codec_cached():
+    assert StructCodec.for_class(AlesisV) is StructCodec.for_class(AlesisV)
+
+def test_codec_paths():
+    c = StructCodec.for_class(AlesisV)
+    assert c.paths[0] == 'keys.base_note'
+    assert c.paths[-1] == 'buttons.button4.channel'
+    assert c.offsets['knobs.knob1.cc'] == 14
+    assert c.types[c.offsets['pads.pad1.mode']] is PadModeEnum
+
+def test_codec_num_bytes():
+    assert AlesisV.num_bytes() == StructCodec.for_class(AlesisV).size
+    assert AlesisV.num_bytes() == len(AlesisV().serialize())
+
+def test_codec_roundtrip():
+    m = AlesisV()
+    m.pads.pad3.note = IntValue(0x40)
+    m.buttons.button2.mode = ButtonModeEnum('Momentary CC')
+    b = m.serialize()
+    m2 = AlesisV.deserialize(b)
+    assert m2.pads.pad3.note.as_int() == 0x40
+    assert m2.buttons.button2.mode.as_string() == 'Momentary CC'
+    assert m2.serialize() == b
+
+def test_codec_short_input():
+    try:
+        AlesisV.deserialize(bytes(AlesisV.num_bytes() - 1))
+        assert False
+    except ValueError:
+        assert True
+
+def test_codec_dict_roundtrip():
+    c = StructCodec.for_class(AlesisV)
+    m = AlesisV()
+    m.knobs.knob4.mode = KnobModeEnum('Aftertouch')
+    d = c.to_dict(m)
+    assert d['knobs.knob4.mode'] == 'Aftertouch'
+    assert d['keys.octave'] == 0x02
+    assert c.from_dict(d).serialize() == m.serialize()
+
+def test_codec_bad_dict():
+    c = StructCodec.for_class(AlesisV)
+    d = c.to_dict(AlesisV())
+    d['keys.foo'] = 1
+    try:
+        c.from_dict(d)
+        assert False
+    except ValueError:
+        assert True
+
+class Wheels (CompoundComponent):
+
+    _COMPONENTS = [
+        ('a', PitchWheel, {}),
+        ('b', PitchWheel, {'channel': IntValue(0x03)})
+    ]
+
+def test_codec_single_field_components():
+    m = Wheels()
+    m.a.channel = IntValue(0x05)
+    m2 = Wheels.deserialize(m.serialize())
+    assert isinstance(m2.a, PitchWheel)
+    assert m2.a.channel.as_int() == 0x05
+    assert m2.b.channel.as_int() == 0x03
+    assert StructCodec.for_class(Wheels).paths == ['a.channel', 'b.channel']
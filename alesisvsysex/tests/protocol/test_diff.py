@@ -0,0 +1,97 @@
+from alesisvsysex.protocol.codec import StructCodec
+from alesisvsysex.protocol.diff import *
+from alesisvsysex.protocol.model import *
+from alesisvsysex.protocol.types import *
+
+def make_pair():
+    a = AlesisV()
+    b = AlesisV()
+    b.buttons.button2.cc = IntValue(0x10)
+    b.pads.pad1.mode = PadModeEnum('Toggle CC')
+    return a, b
+
+def test_diff_empty():
+    p = diff(AlesisV(), AlesisV())
+    assert not p
+    assert len(p) == 0
+    assert p.paths() == []
+
+def test_diff_paths():
+    a, b = make_pair()
+    p = diff(a, b)
+    assert p.paths() == ['pads.pad1.mode', 'buttons.button2.cc']
+    assert p.items()[1] == ('buttons.button2.cc', 49, 16)
+    path, old, new = p.items(decode=True)[0]
+    assert new.as_string() == 'Toggle CC'
+
+def test_diff_bytes_and_models():
+    a, b = make_pair()
+    assert diff(a.serialize(), b.serialize()) == diff(a, b)
+
+def test_patch_apply_bytes():
+    a, b = make_pair()
+    p = diff(a, b)
+    assert p.apply(a.serialize()) == b.serialize()
+    buf = bytearray(a.serialize())
+    assert p.apply(buf) is buf
+    assert bytes(buf) == b.serialize()
+    assert p.invert().apply(b.serialize()) == a.serialize()
+
+def test_patch_apply_model():
+    a, b = make_pair()
+    p = diff(a, b)
+    assert p.apply(a) is a
+    assert a.serialize() == b.serialize()
+
+def test_patch_conflict():
+    a, b = make_pair()
+    p = diff(a, b)
+    try:
+        p.apply(b.serialize())
+        assert False
+    except ValueError:
+        pass
+    try:
+        p.apply(b)
+        assert False
+    except ValueError:
+        pass
+    assert p.apply(b.serialize(), check=False) == b.serialize()
+
+def test_patch_conflict_leaves_target_unchanged():
+    offsets = StructCodec.for_class(AlesisV).offsets
+    # keys.octave matches, then pads.pad1.note conflicts
+    p = Patch([(offsets['keys.octave'], 0x02, 0x03),
+               (offsets['pads.pad1.note'], 0x31, 0x20)])
+    target = AlesisV()
+    target.pads.pad1.note = IntValue(0x10)
+    before = target.serialize()
+    buf = bytearray(before)
+    for t in (buf, target):
+        try:
+            p.apply(t)
+            assert False
+        except ValueError:
+            pass
+    assert bytes(buf) == before
+    assert target.serialize() == before
+
+def test_diff_size_mismatch():
+    try:
+        diff(b'\x00', AlesisV())
+        assert False
+    except ValueError:
+        pass
+
+def test_diff_bank():
+    a, b = make_pair()
+    ref = a.serialize()
+    records = [ref, b.serialize(), ref]
+    patches = diff_bank(records, a)
+    assert [len(p) for p in patches] == [0, 2, 0]
+    assert diff_bank(b''.join(records), ref) == patches
+    try:
+        diff_bank(b''.join(records) + b'\x00', ref)
+        assert False
+    except ValueError:
+        pass
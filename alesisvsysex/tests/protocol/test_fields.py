@@ -0,0 +1,70 @@
+from alesisvsysex.protocol.fields import *
+from alesisvsysex.protocol.model import *
+from alesisvsysex.protocol.sysex import SysexMessage
+from alesisvsysex.protocol.types import *
+
+def test_fields_get():
+    m = AlesisV()
+    m.pads.pad5.channel = IntValue(0x03)
+    b = m.serialize()
+    assert get_field(b, 'pads.pad5.channel') is IntValue(0x03)
+    assert get_field(b, 'pads.pad1.mode') is PadModeEnum('Note')
+
+def test_fields_set_bytearray():
+    buf = bytearray(AlesisV().serialize())
+    assert set_field(buf, 'pads.pad5.channel', 5) is buf
+    set_field(buf, 'knobs.knob2.mode', 'Aftertouch')
+    set_field(buf, 'buttons.button1.cc', IntValue(0x20))
+    m = AlesisV.deserialize(bytes(buf))
+    assert m.pads.pad5.channel.as_int() == 5
+    assert m.knobs.knob2.mode.as_string() == 'Aftertouch'
+    assert m.buttons.button1.cc.as_int() == 0x20
+
+def test_fields_set_bytes():
+    b = AlesisV().serialize()
+    b2 = set_field(b, 'pads.pad1.mode', 'Toggle CC')
+    assert b2 != b
+    assert len(b2) == len(b)
+    assert AlesisV.deserialize(b2).pads.pad1.mode.as_string() == 'Toggle CC'
+
+def test_fields_offset():
+    offset = len(SysexMessage._FRAME_START['update'])
+    frame = bytearray(SysexMessage('update', AlesisV()).serialize())
+    set_field(frame, 'keys.octave', 5, offset=offset)
+    assert get_field(frame, 'keys.octave', offset=offset).as_int() == 5
+    m = SysexMessage.deserialize(bytes(frame)).model
+    assert m.keys.octave.as_int() == 5
+    assert m.keys.base_note.as_int() == AlesisV().keys.base_note.as_int()
+    assert m.keys.channel.as_int() == AlesisV().keys.channel.as_int()
+    m.keys.octave = IntValue(2)
+    assert m.serialize() == AlesisV().serialize()
+
+def test_fields_invalid():
+    buf = bytearray(AlesisV().serialize())
+    for path, value in [('pads.pad1.mode', 'Bogus'),
+                        ('pads.pad1.mode', 0x7f),
+                        ('pads.pad1.note', 'Note'),
+                        ('pads.pad1.note', 0x100),
+                        ('pads.pad1.note', KnobModeEnum('CC'))]:
+        try:
+            set_field(buf, path, value)
+            assert False
+        except ValueError:
+            pass
+    try:
+        get_field(buf, 'pads.pad9.note')
+        assert False
+    except KeyError:
+        pass
+    try:
+        get_field(b'\x00', 'pads.pad1.note')
+        assert False
+    except ValueError:
+        pass
+    assert bytes(buf) == AlesisV().serialize()
+
+def test_fields_index():
+    index = FieldIndex.for_class(AlesisV)
+    assert index is FieldIndex.for_class(AlesisV)
+    assert 'keys.base_note' in index
+    assert len(list(index)) == AlesisV.num_bytes()
@@ -168,3 +168,38 @@ def test_alesisv_default_const():
     a = AlesisV()
     assert a.buttons.button1.cc.as_int() == 0x30
 
+
+def test_keys_slots():
+    k = Keys()
+    assert not hasattr(k, '__dict__')
+    assert Keys.__slots__ == ('base_note', 'octave', 'channel', 'curve')
+
+def test_keys_bad_kwarg_type():
+    try:
+        Keys(octave=PadModeEnum(0x00))
+        assert False
+    except ValueError as e:
+        assert str(e) == ("Invalid type 'PadModeEnum' for field 'octave' - "
+                          "expected 'IntValue'.")
+
+def test_keys_bad_arg_count():
+    try:
+        Keys(IntValue(0x01))
+        assert False
+    except ValueError as e:
+        assert str(e) == ("Invalid argument count for component 'Keys': "
+                          "Expected 4, got 1.")
+
+def test_knobs_bad_positional_type():
+    try:
+        Knobs(Knob(), Knob(), Knob(), Pad())
+        assert False
+    except ValueError as e:
+        assert str(e) == ("Got type 'Pad' for component 'knob4', "
+                          "expected a 'Knob'.")
+
+def test_alesisv_defaults_not_shared():
+    a1 = AlesisV()
+    a2 = AlesisV()
+    a1.pads.pad1.note = IntValue(0x10)
+    assert a2.pads.pad1.note.as_int() == 0x31
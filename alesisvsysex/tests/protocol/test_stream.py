@@ -0,0 +1,59 @@
+import os
+import tempfile
+
+from alesisvsysex.protocol.types import *
+from alesisvsysex.protocol.model import AlesisV
+from alesisvsysex.protocol.sysex import SysexMessage
+from alesisvsysex.protocol.stream import *
+
+def make_dump():
+    m = AlesisV()
+    m.pads.pad1.note = IntValue(0x24)
+    return (SysexMessage('query').serialize()
+            + SysexMessage('reply', m).serialize()
+            + SysexMessage('update', AlesisV()).serialize())
+
+def test_stream_concatenated():
+    p = SysexStreamParser()
+    msgs = list(p.feed(make_dump()))
+    assert [m.type for m in msgs] == ['query', 'reply', 'update']
+    assert msgs[1].model.pads.pad1.note.as_int() == 0x24
+    assert p.errors == 0 and p.discarded == 0
+
+def test_stream_split_chunks():
+    b = make_dump()
+    p = SysexStreamParser()
+    msgs = []
+    for i in range(0, len(b), 7):
+        msgs.extend(p.feed(b[i:i+7]))
+    assert [m.type for m in msgs] == ['query', 'reply', 'update']
+
+def test_stream_resync():
+    q = SysexMessage('query').serialize()
+    b = b'\x01\x02' + q[:5] + q + b'\x90\x40' + q
+    p = SysexStreamParser()
+    msgs = list(p.feed(b))
+    assert len(msgs) == 2
+    assert p.errors == 1
+    assert p.discarded == 4
+
+def test_stream_foreign_frame():
+    b = bytes([0xf0, 0x7e, 0x00, 0x06, 0x01, 0xf7]) + SysexMessage('query').serialize()
+    p = SysexStreamParser()
+    assert [m.type for m in p.feed(b)] == ['query']
+    assert p.errors == 1
+
+def test_stream_oversized_frame():
+    b = bytes([0xf0]) + bytes(1000) + SysexMessage('query').serialize()
+    p = SysexStreamParser()
+    assert [m.type for m in p.feed(b)] == ['query']
+    assert p.errors == 1
+
+def test_stream_iter_file():
+    b = b'\x00' * 3 + make_dump() * 10
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, 'dump.syx')
+        with open(path, 'wb') as f:
+            f.write(b)
+        assert len(list(iter_file(path, chunk_size=16))) == 30
+        assert len(list(iter_file(path, use_mmap=True))) == 30
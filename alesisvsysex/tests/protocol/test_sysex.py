@@ -29,3 +29,37 @@ def test_sysex_deserialize_reply():
     assert r.type == 'reply'
     assert r.model.buttons.button1.cc.as_int() == 0x55
 
+
+def test_sysex_classify():
+    q = SysexMessage('query').serialize()
+    r = SysexMessage('reply', AlesisV()).serialize()
+    assert SysexMessage.classify(q) == 'query'
+    assert SysexMessage.classify(memoryview(r)) == 'reply'
+    assert SysexMessage.classify(bytearray(r[:-1])) is None
+    assert SysexMessage.classify(r[:-1] + b'\x00') is None
+    assert SysexMessage.classify(bytes([0xf0, 0x7e, 0x00, 0xf7])) is None
+    assert SysexMessage.is_v25_frame(q)
+    assert not SysexMessage.is_v25_frame(b'')
+
+def test_sysex_payload():
+    m = AlesisV()
+    m.keys.octave = IntValue(0x03)
+    assert SysexMessage.payload(SysexMessage('update', m).serialize()) == m.serialize()
+    try:
+        SysexMessage.payload(SysexMessage('query').serialize())
+        assert False
+    except ValueError:
+        pass
+
+def test_sysex_num_bytes():
+    assert SysexMessage.num_bytes('query') == 10
+    assert SysexMessage.num_bytes('reply') == 10 + AlesisV.num_bytes()
+
+def test_sysex_deserialize_errors():
+    q = SysexMessage('query').serialize()
+    for b in (b'', q[:5], b'\x00' + q[1:], q[:6] + b'\x70' + q[7:], q[:-1] + b'\x00'):
+        try:
+            SysexMessage.deserialize(b)
+            assert False
+        except ValueError:
+            assert True
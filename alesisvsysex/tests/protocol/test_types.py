@@ -30,3 +30,26 @@ def test_enumval_serialize():
 def test_enumval_deserialiez():
     assert PadModeEnum.deserialize(bytes([0x01])).as_int() == 0x01
     
+
+def test_intval_interned():
+    assert IntValue(0x05) is IntValue(0x05)
+    assert IntValue(0xff) is IntValue.deserialize(bytes([0xff]))
+
+def test_intval_immutable():
+    v = IntValue(5)
+    try:
+        v._value = 6
+        assert False
+    except AttributeError:
+        assert IntValue(5).as_int() == 5
+
+def test_enumval_interned():
+    assert PadModeEnum(0x01) is PadModeEnum('Toggle CC')
+    assert PadModeEnum(0x01) is not ButtonModeEnum(0x01)
+
+def test_enumval_bad_value():
+    try:
+        PadModeEnum(0x03)
+        assert False
+    except ValueError:
+        assert True
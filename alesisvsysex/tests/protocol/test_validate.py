@@ -0,0 +1,50 @@
+from alesisvsysex.protocol.model import *
+from alesisvsysex.protocol.types import *
+from alesisvsysex.protocol.codec import StructCodec
+from alesisvsysex.protocol.validate import *
+
+def make_invalid():
+    m = AlesisV()
+    m.pads.pad1.note = IntValue(0x80)
+    m.keys.channel = IntValue(0x10)
+    m.knobs.knob3.min = IntValue(0x60)
+    m.knobs.knob3.max = IntValue(0x20)
+    return m
+
+def test_validate_default():
+    assert validate(AlesisV()) == []
+    assert validate(AlesisV().serialize()) == []
+
+def test_validate_model():
+    violations = validate(make_invalid())
+    assert [v.path for v in violations] == ['keys.channel', 'pads.pad1.note', 'knobs.knob3.min']
+    assert violations[0].value == 0x10
+    assert violations[2].message == "greater than knobs.knob3.max (32)"
+    assert validate(make_invalid().serialize()) == violations
+
+def test_validate_unserializable():
+    m = AlesisV()
+    m.keys.curve = IntValue(0x1000)
+    assert [v.path for v in validate(m)] == ['keys.curve']
+
+def test_validate_bad_enum_byte():
+    b = bytearray(AlesisV().serialize())
+    b[StructCodec.for_class(AlesisV).offsets['pads.pad2.mode']] = 0x05
+    violations = validate(bytes(b))
+    assert len(violations) == 1
+    assert violations[0].message == "invalid PadModeEnum code"
+
+def test_validate_bank():
+    records = [AlesisV(), make_invalid(), AlesisV(), make_invalid()]
+    violations = validate_bank(records)
+    assert len(violations) == 6
+    assert {v.index for v in violations} == {1, 3}
+    assert validate_bank(b''.join(r.serialize() for r in records)) == violations
+
+def test_ensure_valid():
+    ensure_valid(AlesisV())
+    try:
+        ensure_valid(make_invalid())
+        assert False
+    except ValueError as e:
+        assert 'pads.pad1.note' in str(e)
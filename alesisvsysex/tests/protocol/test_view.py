@@ -0,0 +1,53 @@
+from alesisvsysex.protocol.model import *
+from alesisvsysex.protocol.types import *
+from alesisvsysex.protocol.view import *
+
+def test_view_default_const():
+    v = AlesisVView()
+    assert v.serialize() == AlesisV().serialize()
+    assert v.buttons.button1.cc.as_int() == 0x30
+
+def test_view_getattr():
+    m = AlesisV()
+    m.pads.pad3.note = IntValue(0x40)
+    v = AlesisVView.from_model(m)
+    assert v.pads.pad3.note.as_int() == 0x40
+    assert v.pads.pad3.mode.as_string() == 'Note'
+
+def test_view_setattr():
+    v = AlesisVView()
+    v.knobs.knob2.cc = IntValue(0x55)
+    v.pads.pad1.mode = PadModeEnum('Toggle CC')
+    m = v.to_model()
+    assert m.knobs.knob2.cc.as_int() == 0x55
+    assert m.pads.pad1.mode.as_string() == 'Toggle CC'
+
+def test_view_bad_setattr():
+    v = AlesisVView()
+    try:
+        v.pads.pad1.mode = IntValue(0x01)
+        assert False
+    except ValueError:
+        assert True
+
+def test_view_deserialize_no_copy():
+    b = bytearray(AlesisV().serialize())
+    v = AlesisVView.deserialize(b)
+    v.keys.octave = IntValue(0x03)
+    assert b[1] == 0x03
+
+def test_view_copy():
+    v1 = AlesisVView()
+    v2 = v1.copy()
+    v1.keys.octave = IntValue(0x05)
+    assert v2.keys.octave.as_int() == 0x02
+
+def test_view_bank():
+    m = AlesisV()
+    m.keys.channel = IntValue(0x03)
+    buf = bytearray(AlesisV().serialize() + m.serialize())
+    views = list(AlesisVView.iter_bank(buf))
+    assert len(views) == 2
+    assert views[1].keys.channel.as_int() == 0x03
+    views[0].keys.channel = IntValue(0x04)
+    assert AlesisV.deserialize(buf).keys.channel.as_int() == 0x04
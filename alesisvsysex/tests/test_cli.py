@@ -0,0 +1,98 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from alesisvsysex.cli import *
+from alesisvsysex.device.file import FileDevice
+from alesisvsysex.protocol.model import *
+from alesisvsysex.protocol.sysex import SysexMessage
+from alesisvsysex.protocol.types import *
+
+def write_raw(d, name, model):
+    path = os.path.join(d, name)
+    FileDevice(path).set_config(model)
+    return path
+
+def test_cli_convert_roundtrip():
+    with tempfile.TemporaryDirectory() as d:
+        m = AlesisV()
+        m.pads.pad4.note = IntValue(0x3c)
+        raw = write_raw(d, 'a.syx', m)
+        framed = os.path.join(d, 'b.syx')
+        back = os.path.join(d, 'c.syx')
+        assert main(['convert', raw, framed, '--to', 'update']) == 0
+        with open(framed, 'rb') as f:
+            assert SysexMessage.classify(f.read()) == 'update'
+        assert main(['convert', framed, back]) == 0
+        assert FileDevice(back).get_config().serialize() == m.serialize()
+
+def test_cli_convert_directory(capsys):
+    with tempfile.TemporaryDirectory() as d:
+        src = os.path.join(d, 'src')
+        os.mkdir(src)
+        write_raw(src, 'a.syx', AlesisV())
+        out = os.path.join(d, 'out')
+        assert main(['convert', src, out, '-t', 'json', '-j', '1']) == 0
+        with open(os.path.join(out, 'a.json')) as f:
+            assert json.load(f)['pads.pad1.mode'] == 'Note'
+        assert "converted 1 of 1 files" in capsys.readouterr().err
+
+def test_cli_dump_json():
+    with tempfile.TemporaryDirectory() as d:
+        raw = write_raw(d, 'a.syx', AlesisV())
+        out = os.path.join(d, 'a.json')
+        assert main(['dump', raw, '-o', out, '-f', 'json']) == 0
+        with open(out) as f:
+            assert json.load(f)['pads.pad1.mode'] == 'Note'
+        copy = os.path.join(d, 'copy.syx')
+        assert main(['load', out, copy]) == 0
+        assert FileDevice(copy).get_config().serialize() == AlesisV().serialize()
+
+def test_cli_load_check():
+    with tempfile.TemporaryDirectory() as d:
+        m = AlesisV()
+        m.pads.pad1.channel = IntValue(0x10)
+        bad = write_raw(d, 'bad.syx', m)
+        out = os.path.join(d, 'out.syx')
+        assert main(['load', bad, out, '--check']) == 1
+        assert not os.path.exists(out)
+        assert main(['load', bad, out]) == 0
+
+def test_cli_diff(capsys):
+    with tempfile.TemporaryDirectory() as d:
+        m = AlesisV()
+        m.buttons.button2.cc = IntValue(0x10)
+        a = write_raw(d, 'a.syx', AlesisV())
+        b = write_raw(d, 'b.syx', m)
+        assert main(['diff', a, a]) == 0
+        assert main(['diff', a, b]) == 1
+        assert capsys.readouterr().out == "buttons.button2.cc: 49 -> 16\n"
+
+def test_cli_verify():
+    with tempfile.TemporaryDirectory() as d:
+        good = write_raw(d, 'a.syx', AlesisV())
+        bad = os.path.join(d, 'b.syx')
+        with open(bad, 'wb') as f:
+            f.write(b'\x00\x01')
+        assert main(['verify', '-q', good]) == 0
+        assert main(['verify', '-q', good, bad]) == 1
+        m = AlesisV()
+        m.keys.channel = IntValue(0x20)
+        invalid = write_raw(d, 'c.syx', m)
+        assert main(['verify', '-q', invalid]) == 1
+
+def test_cli_no_qt():
+    code = ("import sys, alesisvsysex.cli; "
+            "sys.exit(any(m.startswith(('PyQt5', 'alesisvsysex.ui')) for m in sys.modules))")
+    assert subprocess.call([sys.executable, '-c', code]) == 0
+
+def test_cli_dispatch():
+    from alesisvsysex.__main__ import wants_cli
+    assert wants_cli(['dump', '-o', 'x.json'])
+    assert wants_cli(['--help'])
+    assert wants_cli(['--timeout=2', 'dump'])
+    assert not wants_cli([])
+    assert not wants_cli(['-style', 'fusion', 'dump'])
+    assert not wants_cli(['diff.syx', 'load'])
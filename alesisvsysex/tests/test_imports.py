@@ -0,0 +1,27 @@
+import subprocess
+import sys
+
+def loaded_after(statement):
+    code = ("import sys; %s; "
+            "print(' '.join(sorted(m for m in sys.modules "
+            "if m.split('.')[0] in ('mido', 'rtmidi', 'PyQt5', 'numpy'))))" % statement)
+    return subprocess.check_output([sys.executable, '-c', code]).decode().split()
+
+def test_import_package_is_lazy():
+    assert loaded_after('import alesisvsysex') == []
+
+def test_import_protocol_model():
+    assert loaded_after('import alesisvsysex.protocol.model') == []
+
+def test_import_device_file():
+    assert loaded_after('import alesisvsysex.device.file') == []
+
+def test_lazy_attribute_access():
+    import alesisvsysex
+    assert alesisvsysex.protocol.sysex.SysexMessage.num_bytes('query') == 10
+    assert 'codec' in dir(alesisvsysex.protocol)
+    try:
+        alesisvsysex.protocol.foo
+        assert False
+    except AttributeError:
+        assert True
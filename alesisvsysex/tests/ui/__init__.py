@@ -0,0 +1,3 @@
+import alesisvsysex.tests.ui.test_history
+import alesisvsysex.tests.ui.test_worker
+import alesisvsysex.tests.ui.test_editor
@@ -0,0 +1,80 @@
+import os
+import tempfile
+
+from alesisvsysex.device.file import FileDevice
+from alesisvsysex.protocol.diff import diff
+from alesisvsysex.protocol.model import AlesisV
+from alesisvsysex.protocol.types import *
+from alesisvsysex.tests.ui import test_worker
+from alesisvsysex.ui.values import IntegerSelector
+
+def field_widgets(win):
+    fields = {}
+    for c in win.widget.editorWidget.children:
+        fields.update(c.fieldWidgets())
+    return fields
+
+def watch(fields):
+    # Records the paths of selectors whose displayed value is set
+    touched = []
+    for path, w in fields.items():
+        name = 'setValue' if isinstance(w, IntegerSelector) else 'setCurrentIndex'
+        def wrapper(v, path=path, fn=getattr(w, name)):
+            touched.append(path)
+            fn(v)
+        setattr(w, name, wrapper)
+    return touched
+
+def test_load_presets_refresh(monkeypatch):
+    win = test_worker.make_window(monkeypatch)
+    a = AlesisV()
+    a.keys.octave = IntValue(0x04)
+    b = a.copy()
+    b.pads.pad3.note = IntValue(0x30)
+    b.knobs.knob1.mode = KnobModeEnum('Aftertouch')
+    fields = field_widgets(win)
+    touched = watch(fields)
+    with tempfile.TemporaryDirectory() as d:
+        for name, m in (('a.syx', a), ('b.syx', b)):
+            FileDevice(os.path.join(d, name)).set_config(m)
+        win.loadFileCallback(os.path.join(d, 'a.syx'))
+        assert touched == ['keys.octave']
+        del touched[:]
+        win.loadFileCallback(os.path.join(d, 'b.syx'))
+    assert sorted(touched) == sorted(diff(a, b).paths())
+    assert win.model.serialize() == b.serialize()
+    # Each load is one entry; refreshing the selectors records nothing
+    assert len(win.history) == 2 and win.history.position == 2
+    assert win.history.state() == b.serialize()
+    assert fields['pads.pad3.note'].value() == 0x30
+    assert fields['knobs.knob1.mode'].currentText() == 'Aftertouch'
+
+def test_edit_undo_redo(monkeypatch):
+    win = test_worker.make_window(monkeypatch)
+    fields = field_widgets(win)
+    note = fields['pads.pad1.note']
+    mode = fields['knobs.knob2.mode']
+    assert not win.undoAction.isEnabled()
+
+    note.setValue(0x40)
+    mode.setCurrentIndex(mode.findText('Aftertouch'))
+    assert len(win.history) == 2
+    assert win.model.pads.pad1.note.as_int() == 0x40
+    assert win.model.knobs.knob2.mode.as_string() == 'Aftertouch'
+    assert win.undoAction.isEnabled() and not win.redoAction.isEnabled()
+
+    touched = watch(fields)
+    win.undo()
+    assert touched == ['knobs.knob2.mode']
+    assert mode.currentText() == 'CC'
+    assert win.model.knobs.knob2.mode.as_string() == 'CC'
+    win.undo()
+    assert note.value() == AlesisV().pads.pad1.note.as_int()
+    assert win.model.serialize() == AlesisV().serialize()
+    assert not win.undoAction.isEnabled() and win.redoAction.isEnabled()
+
+    win.redo()
+    assert note.value() == 0x40
+    assert win.model.pads.pad1.note.as_int() == 0x40
+    # Refreshing the selectors must not record new entries
+    assert len(win.history) == 2 and win.history.position == 1
@@ -0,0 +1,91 @@
+from alesisvsysex.protocol.model import AlesisV
+from alesisvsysex.protocol.types import *
+from alesisvsysex.ui.history import EditHistory
+
+def test_history_undo_redo():
+    h = EditHistory(AlesisV())
+    assert not h.can_undo()
+    assert h.record('pads.pad1.note', 0x40)
+    assert h.record('knobs.knob2.mode', 'Aftertouch')
+    assert not h.record('knobs.knob2.mode', 'Aftertouch')
+    assert len(h) == 2
+
+    p = h.undo()
+    assert p.paths() == ['knobs.knob2.mode']
+    assert h.model().knobs.knob2.mode.as_string() == 'CC'
+    p = h.undo()
+    assert p.paths() == ['pads.pad1.note']
+    assert h.state() == AlesisV().serialize()
+    assert h.undo() is None
+
+    h.redo()
+    h.redo()
+    assert h.redo() is None
+    m = h.model()
+    assert m.pads.pad1.note.as_int() == 0x40
+    assert m.knobs.knob2.mode.as_string() == 'Aftertouch'
+
+def test_history_patch_applies_to_model():
+    model = AlesisV()
+    h = EditHistory(model)
+    model.pads.pad1.note = IntValue(0x40)
+    h.record('pads.pad1.note', 0x40)
+    h.undo().apply(model)
+    assert model.serialize() == AlesisV().serialize()
+
+def test_history_discards_redo_branch():
+    h = EditHistory()
+    h.record('pads.pad1.note', 1)
+    h.record('pads.pad1.note', 2)
+    h.undo()
+    h.record('pads.pad1.note', 3)
+    assert len(h) == 2
+    assert not h.can_redo()
+    assert h.model().pads.pad1.note.as_int() == 3
+
+def test_history_commit():
+    h = EditHistory()
+    m = AlesisV()
+    m.keys.octave = IntValue(0x03)
+    m.pads.pad2.channel = IntValue(0x05)
+    assert h.commit(m)
+    assert not h.commit(m)
+    assert set(h.undo().paths()) == {'keys.octave', 'pads.pad2.channel'}
+
+def test_history_jump_and_snapshots():
+    h = EditHistory(snapshot_interval=4)
+    for i in range(20):
+        h.record('pads.pad1.note', i + 1)
+    p = h.jump(5)
+    assert p.paths() == ['pads.pad1.note']
+    assert h.model().pads.pad1.note.as_int() == 5
+    h.jump(17)
+    assert h.model().pads.pad1.note.as_int() == 17
+    h.jump(0)
+    assert h.state() == AlesisV().serialize()
+    try:
+        h.jump(21)
+        assert False
+    except IndexError:
+        pass
+
+def test_history_bounded():
+    h = EditHistory(capacity=10, snapshot_interval=3)
+    for i in range(25):
+        h.record('pads.pad1.note', i + 1)
+    assert len(h) == 10
+    assert h.position == 10
+    h.jump(0)
+    assert h.model().pads.pad1.note.as_int() == 15
+    for i in range(10):
+        h.redo()
+        assert h.model().pads.pad1.note.as_int() == 16 + i
+
+def test_history_invalid():
+    h = EditHistory()
+    try:
+        h.record('pads.pad1.mode', 'Bogus')
+        assert False
+    except ValueError:
+        pass
+    assert len(h) == 0
@@ -0,0 +1,120 @@
+import os
+import threading
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtWidgets import QApplication
+
+import alesisvsysex.ui.window as window
+from alesisvsysex.protocol.model import AlesisV
+from alesisvsysex.protocol.types import IntValue
+from alesisvsysex.protocol.validate import ensure_valid
+from alesisvsysex.ui.worker import DeviceWorker
+
+app = QApplication.instance() or QApplication([])
+
+class Recorder (object):
+
+    def __init__(self, worker):
+        self.events = []
+        worker.signals.finished.connect(lambda r: self.events.append(('finished', r)))
+        worker.signals.failed.connect(lambda e: self.events.append(('failed', e)))
+        worker.signals.done.connect(lambda: self.events.append(('done',)))
+
+def test_worker_result():
+    w = DeviceWorker(lambda x, timeout: (x, timeout), 1, timeout=2.0)
+    r = Recorder(w)
+    w.run()
+    assert r.events == [('finished', (1, 2.0)), ('done',)]
+
+def test_worker_error():
+    def fail(timeout):
+        raise TimeoutError()
+    w = DeviceWorker(fail)
+    r = Recorder(w)
+    w.run()
+    assert r.events == [('failed', 'TimeoutError'), ('done',)]
+
+def test_worker_cancelled():
+    def op(timeout):
+        w.cancel()
+        return 1
+    w = DeviceWorker(op)
+    r = Recorder(w)
+    w.run()
+    assert r.events == [('done',)]
+
+def test_worker_needs_timeout():
+    try:
+        DeviceWorker(lambda timeout: None, timeout=None)
+        assert False
+    except ValueError:
+        pass
+
+class FakeDevice (object):
+
+    def __init__(self, *args):
+        self.release = threading.Event()
+        self.timeouts = []
+        self.saved = []
+
+    def get_config(self, timeout=None):
+        self.timeouts.append(timeout)
+        self.release.wait(5)
+        m = AlesisV()
+        m.keys.octave = IntValue(0x04)
+        return m
+
+    def set_config(self, model, timeout=None, verify=True, check=False):
+        if check:
+            ensure_valid(model)
+        self.saved.append(model)
+
+def make_window(monkeypatch):
+    monkeypatch.setattr(window, 'AlesisV25Device', FakeDevice)
+    win = window.AlesisVSysexApplication()
+    win.hide()
+    return win
+
+def finish(win):
+    win.threadPool.waitForDone(5000)
+    app.processEvents()
+
+def test_window_load_device(monkeypatch):
+    win = make_window(monkeypatch)
+    win.loadDevice()
+    win.device.release.set()
+    finish(win)
+    assert win.model.keys.octave.as_int() == 0x04
+    assert win.device.timeouts == [window.DEVICE_TIMEOUT]
+    assert win.worker is None
+
+def test_window_cancel_drops_result(monkeypatch):
+    win = make_window(monkeypatch)
+    win.loadDevice()
+    win.cancelDevice()
+    win.device.release.set()
+    finish(win)
+    assert win.model.serialize() == AlesisV().serialize()
+    assert win.statusBar().currentMessage() == "Cancelled."
+    assert win.worker is None
+    assert win.widget.actionWidget.bloadd.isEnabled()
+
+def test_window_cancel_after_emit(monkeypatch):
+    # The result is already queued when the cancel arrives
+    win = make_window(monkeypatch)
+    win.loadDevice()
+    win.device.release.set()
+    win.threadPool.waitForDone(5000)
+    win.cancelDevice()
+    app.processEvents()
+    assert win.model.serialize() == AlesisV().serialize()
+    assert win.worker is None
+
+def test_window_save_checks(monkeypatch):
+    win = make_window(monkeypatch)
+    win.model.keys.channel = IntValue(0x10)
+    win.saveDevice()
+    finish(win)
+    assert win.device.saved == []
+    assert win.statusBar().currentMessage().startswith("MIDI device error: Invalid configuration")
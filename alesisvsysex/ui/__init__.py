@@ -1,6 +1,6 @@
-import alesisvsysex.ui.values
-import alesisvsysex.ui.components
-import alesisvsysex.ui.filedialog
-import alesisvsysex.ui.window
-import alesisvsysex.ui.main
+from alesisvsysex._lazy import lazy_submodules
 
+__getattr__, __dir__ = lazy_submodules(__name__, [
+    'values', 'components', 'filedialog', 'worker', 'window', 'main',
+    'history'
+])
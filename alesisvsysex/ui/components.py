@@ -26,13 +26,26 @@ class BasicWidget (QGroupBox):
         
         self.setLayout(layout)
         
-    def updateState(self):
+    def updateState(self, model=None):
+        if model is None:
+            model = self.getModel()
         for c in self.children:
-            c.updateState()
+            c.updateState(model)
     
     def getModel(self):
         return getattr(self.parent().getModel(), self.componentKey)
 
+    def componentPath(self):
+        prefix = self.parent().componentPath()
+        return '%s.%s' % (prefix, self.componentKey) if prefix else self.componentKey
+
+    def recordEdit(self, path, value):
+        self.parent().recordEdit(path, value)
+
+    def fieldWidgets(self):
+        for c in self.children:
+            yield c.fieldPath(), c
+
 class CompoundWidget (QGroupBox):
     
     def __init__(self, parent, name, component_key):
@@ -52,7 +65,7 @@ class CompoundWidget (QGroupBox):
         layout.setColumnStretch(2, 1)
         layout.setColumnStretch(3, 1)
         for name, _, __ in self.getModel()._COMPONENTS:
-            model = self.getModel()._components[name]
+            model = getattr(self.getModel(), name)
             if isinstance(model, BasicComponent):
                 widget = BasicWidget(self, name, name)
             elif isinstance(model, CompoundComponent):
@@ -61,10 +74,22 @@ class CompoundWidget (QGroupBox):
             layout.addWidget(widget)
         self.setLayout(layout)
 
-    def updateState(self):
+    def updateState(self, model=None):
+        if model is None:
+            model = self.getModel()
         for c in self.children:
-            c.updateState()
+            c.updateState(getattr(model, c.componentKey))
 
     def getModel(self):
         return getattr(self.parent().getModel(), self.componentKey)
 
+    def componentPath(self):
+        prefix = self.parent().componentPath()
+        return '%s.%s' % (prefix, self.componentKey) if prefix else self.componentKey
+
+    def recordEdit(self, path, value):
+        self.parent().recordEdit(path, value)
+
+    def fieldWidgets(self):
+        for c in self.children:
+            yield from c.fieldWidgets()
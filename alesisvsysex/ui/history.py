@@ -0,0 +1,120 @@
+from collections import deque
+
+from alesisvsysex.protocol.diff import Patch, diff
+from alesisvsysex.protocol.fields import FieldIndex
+from alesisvsysex.protocol.model import AlesisV
+
+__all__ = ['EditHistory']
+
+class EditHistory (object):
+
+    # Undo/redo for the editor, kept free of Qt. Every edit is stored as a
+    # Patch against the serialized configuration, so a keystroke costs one
+    # (offset, old, new) tuple. At most `capacity` entries are kept; older
+    # ones are folded into the base state. A full copy of the state is kept
+    # every `snapshot_interval` entries to bound the work of long jumps.
+    #
+    # Positions count applied entries since the base state: 0 is the oldest
+    # state still reachable, len(history) the newest.
+
+    def __init__(self, model=None, capacity=1000, snapshot_interval=50):
+        if capacity < 1 or snapshot_interval < 1:
+            raise ValueError("History capacity and snapshot interval must be positive.")
+        self.capacity = capacity
+        self.snapshot_interval = snapshot_interval
+        self._fields = FieldIndex.for_class(AlesisV)
+        self.reset(model)
+
+    def reset(self, model=None):
+        self._base = (model or AlesisV()).serialize()
+        self._current = bytearray(self._base)
+        self._entries = deque()
+        self._snapshots = {}
+        self._position = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def position(self):
+        return self._position
+
+    def can_undo(self):
+        return self._position > 0
+
+    def can_redo(self):
+        return self._position < len(self._entries)
+
+    def state(self):
+        return bytes(self._current)
+
+    def model(self):
+        return AlesisV.deserialize(bytes(self._current))
+
+    def record(self, path, value):
+        # Records a single field edit; returns False if it changed nothing
+        i, v = self._fields.encode(path, value)
+        old = self._current[i]
+        if old == v:
+            return False
+        self._push(Patch(((i, old, v),)))
+        return True
+
+    def commit(self, model):
+        # Records the replacement of the whole configuration, e.g. on load
+        patch = diff(self._current, model)
+        if not patch:
+            return False
+        self._push(patch)
+        return True
+
+    def _push(self, patch):
+        if self._position < len(self._entries):
+            # A new edit discards the redo branch
+            for _ in range(len(self._entries) - self._position):
+                self._entries.pop()
+            self._snapshots = {k: v for k, v in self._snapshots.items()
+                               if k <= self._position}
+        patch.apply(self._current)
+        self._entries.append(patch)
+        self._position += 1
+        if self._position % self.snapshot_interval == 0:
+            self._snapshots[self._position] = bytes(self._current)
+        if len(self._entries) > self.capacity:
+            self._base = self._entries.popleft().apply(self._base)
+            self._position -= 1
+            self._snapshots = {k - 1: v for k, v in self._snapshots.items() if k > 1}
+
+    def undo(self):
+        if not self.can_undo():
+            return None
+        return self.jump(self._position - 1)
+
+    def redo(self):
+        if not self.can_redo():
+            return None
+        return self.jump(self._position + 1)
+
+    def jump(self, position):
+        # Moves to `position` and returns the Patch from the previous state
+        # to the new one, so callers only refresh the fields that changed
+        if not 0 <= position <= len(self._entries):
+            raise IndexError("History position %d out of range 0-%d"
+                             % (position, len(self._entries)))
+        anchors = dict(self._snapshots)
+        anchors[0] = self._base
+        anchors[self._position] = self._current
+        start = min(anchors, key=lambda k: abs(k - position))
+
+        state = bytearray(anchors[start])
+        if start < position:
+            for i in range(start, position):
+                self._entries[i].apply(state)
+        else:
+            for i in range(start - 1, position - 1, -1):
+                self._entries[i].invert().apply(state)
+
+        patch = diff(self._current, state)
+        self._current = state
+        self._position = position
+        return patch
@@ -6,44 +6,70 @@ class IntegerSelector (QSpinBox):
     def __init__(self, parent, field):
         super().__init__(parent)
         self.fieldName = field
+        self.shownValue = None
         self.setRange(0x00, 0x7f)
         self.setSingleStep(1)
         self.updateState()
         self.valueChanged.connect(self.updateModel)
         
-    def updateState(self):
-        self.setValue(getattr(self.getModel(), self.fieldName).as_int())
+    def updateState(self, model=None):
+        # Only touch the widget if the field changed, and never echo the
+        # refresh back into the model
+        if model is None:
+            model = self.getModel()
+        v = getattr(model, self.fieldName).as_int()
+        if v != self.shownValue:
+            self.shownValue = v
+            self.blockSignals(True)
+            self.setValue(v)
+            self.blockSignals(False)
     
     def updateModel(self):
-        setattr(self.getModel(), self.fieldName, IntValue(self.value()))
+        v = self.value()
+        if v != self.shownValue:
+            self.shownValue = v
+            setattr(self.getModel(), self.fieldName, IntValue(v))
+            self.parent().recordEdit(self.fieldPath(), v)
     
     def getModel(self):
         return self.parent().getModel()
 
+    def fieldPath(self):
+        return '%s.%s' % (self.parent().componentPath(), self.fieldName)
+
 class EnumSelector (QComboBox):
 
     def __init__(self, parent, field):
         super().__init__(parent)
         self.fieldName = field
-        self.enumClass = self.getModel()._params[field].__class__
+        self.enumClass = getattr(self.getModel(), field).__class__
         self.enumValues = list(sorted(self.enumClass._VALUES.items(), key=lambda x: x[1]))
+        self.enumIndex = {v: i for i, (k, v) in enumerate(self.enumValues)}
         for k, v in self.enumValues:
             self.addItem(k, v)
         self.updateState()
         self.currentIndexChanged.connect(self.updateModel)
         
-    def updateState(self):
-        for i, (k, v) in enumerate(self.enumValues):
-            if getattr(self.getModel(), self.fieldName).as_int() == v:
-                self.setCurrentIndex(i)
-                break
-        else:
+    def updateState(self, model=None):
+        if model is None:
+            model = self.getModel()
+        try:
+            i = self.enumIndex[getattr(model, self.fieldName).as_int()]
+        except KeyError:
             raise RuntimeError("Invalid state for component '%s' field '%s'"
-                               % (self.getModel().__class__.__name__, self.fieldName))
+                               % (model.__class__.__name__, self.fieldName))
+        if i != self.currentIndex():
+            self.blockSignals(True)
+            self.setCurrentIndex(i)
+            self.blockSignals(False)
                                
     def updateModel(self):
-        setattr(self.getModel(), self.fieldName, self.enumClass(self.enumValues[self.currentIndex()][1]))
+        v = self.enumValues[self.currentIndex()][1]
+        setattr(self.getModel(), self.fieldName, self.enumClass(v))
+        self.parent().recordEdit(self.fieldPath(), v)
 
     def getModel(self):
         return self.parent().getModel()
 
+    def fieldPath(self):
+        return '%s.%s' % (self.parent().componentPath(), self.fieldName)
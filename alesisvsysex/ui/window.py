@@ -1,12 +1,18 @@
+from PyQt5.QtCore import QThreadPool
+from PyQt5.QtGui import QKeySequence
 from PyQt5.QtWidgets import *
 from alesisvsysex.protocol.model import AlesisV
 from alesisvsysex.device.alesis import AlesisV25Device
 from alesisvsysex.device.file import FileDevice
 from alesisvsysex.ui.components import *
 from alesisvsysex.ui.filedialog import *
+from alesisvsysex.ui.history import EditHistory
+from alesisvsysex.ui.worker import DeviceWorker
 
 __all__ = ['AlesisVSysexApplication']
 
+DEVICE_TIMEOUT = 5.0
+
 class ActionMenuWidget (QWidget):
 
     def __init__(self, parent):
@@ -16,25 +22,30 @@ class ActionMenuWidget (QWidget):
     def initLayout(self):
         layout = QHBoxLayout()
         
-        bsavef = QPushButton('Save To File', self)
-        bsavef.clicked.connect(self.propagateCommand('saveFile'))
-        layout.addWidget(bsavef)
+        self.bsavef = QPushButton('Save To File', self)
+        self.bsavef.clicked.connect(self.propagateCommand('saveFile'))
+        layout.addWidget(self.bsavef)
         
-        bloadf = QPushButton('Load From File', self)
-        bloadf.clicked.connect(self.propagateCommand('loadFile'))
-        layout.addWidget(bloadf)
+        self.bloadf = QPushButton('Load From File', self)
+        self.bloadf.clicked.connect(self.propagateCommand('loadFile'))
+        layout.addWidget(self.bloadf)
         
-        bsaved = QPushButton('Save To Device', self)
-        bsaved.clicked.connect(self.propagateCommand('saveDevice'))
-        layout.addWidget(bsaved)
+        self.bsaved = QPushButton('Save To Device', self)
+        self.bsaved.clicked.connect(self.propagateCommand('saveDevice'))
+        layout.addWidget(self.bsaved)
         
-        bloadd = QPushButton('Load From Device', self)
-        bloadd.clicked.connect(self.propagateCommand('loadDevice'))
-        layout.addWidget(bloadd)
+        self.bloadd = QPushButton('Load From Device', self)
+        self.bloadd.clicked.connect(self.propagateCommand('loadDevice'))
+        layout.addWidget(self.bloadd)
         
         self.setLayout(layout)
         self.setFixedHeight(50)
     
+    def setDeviceBusy(self, busy, loading=False):
+        self.bsaved.setEnabled(not busy)
+        self.bloadd.setEnabled(not busy)
+        self.bloadf.setEnabled(not loading)
+
     def propagateCommand(self, command):
         def closure():
             getattr(self.parent().parent(), command)()
@@ -45,17 +56,27 @@ class ContainerWidget (QWidget):
     def __init__(self):
         super().__init__()
         
-    def getModel(self):
+    def getEditor(self):
         p = self.parent()
         while not isinstance(p, EditorWidget):
             p = p.parent()
-        return p.getModel()
+        return p
+
+    def getModel(self):
+        return self.getEditor().getModel()
+
+    def componentPath(self):
+        return ''
+
+    def recordEdit(self, path, value):
+        self.getEditor().recordEdit(path, value)
 
 class EditorWidget (QTabWidget):
 
     def __init__(self, parent):
         super().__init__(parent)
         self.children = []
+        self.fields = None
         self.initLayout()
         
     def addChild(self, parent, widget):
@@ -92,10 +113,26 @@ class EditorWidget (QTabWidget):
 
     def getModel(self):
         return self.parentWidget().parentWidget().model
+
+    def componentPath(self):
+        return ''
+
+    def recordEdit(self, path, value):
+        self.parentWidget().parentWidget().recordEdit(path, value)
         
     def updateState(self):
+        model = self.getModel()
         for c in self.children:
-            c.updateState()
+            c.updateState(getattr(model, c.componentKey))
+
+    def updateFields(self, paths):
+        # Refresh only the selectors showing `paths`
+        if self.fields is None:
+            self.fields = {}
+            for c in self.children:
+                self.fields.update(c.fieldWidgets())
+        for p in paths:
+            self.fields[p].updateState()
 
 class MainWidget (QWidget):
     
@@ -114,23 +151,90 @@ class MainWidget (QWidget):
     def updateState(self):
         self.editorWidget.updateState()
 
+    def updateFields(self, paths):
+        self.editorWidget.updateFields(paths)
+
+    def setDeviceBusy(self, busy, loading=False):
+        self.actionWidget.setDeviceBusy(busy, loading)
+        self.editorWidget.setEnabled(not loading)
+
 class AlesisVSysexApplication (QMainWindow):
 
     def __init__(self):
         super().__init__()
         self.model = AlesisV()
+        self.history = EditHistory(self.model)
         self.device = AlesisV25Device()
+        self.threadPool = QThreadPool()
+        self.worker = None
+        self.deviceCallback = None
         self.initWindow()
 
     def initWindow(self):
         self.setWindowTitle('Alesis V-Series SysEx Editor')
         self.initWidget()
+        self.initActions()
+        self.initStatusBar()
         self.statusBar().showMessage('Ready.')
         self.show()
+
+    def initStatusBar(self):
+        self.progress = QProgressBar(self)
+        self.progress.setRange(0, 0)
+        self.progress.setMaximumWidth(120)
+        self.progress.hide()
+        self.statusBar().addPermanentWidget(self.progress)
+
+        self.cancelButton = QPushButton('Cancel', self)
+        self.cancelButton.clicked.connect(self.cancelDevice)
+        self.cancelButton.hide()
+        self.statusBar().addPermanentWidget(self.cancelButton)
         
     def initWidget(self):
         self.widget = MainWidget(self)
         self.setCentralWidget(self.widget)
+
+    def initActions(self):
+        menu = self.menuBar().addMenu('&Edit')
+
+        self.undoAction = QAction('&Undo', self)
+        self.undoAction.setShortcut(QKeySequence.Undo)
+        self.undoAction.triggered.connect(self.undo)
+        menu.addAction(self.undoAction)
+
+        self.redoAction = QAction('&Redo', self)
+        self.redoAction.setShortcut(QKeySequence.Redo)
+        self.redoAction.triggered.connect(self.redo)
+        menu.addAction(self.redoAction)
+
+        self.updateHistoryActions()
+
+    def updateHistoryActions(self):
+        self.undoAction.setEnabled(self.history.can_undo())
+        self.redoAction.setEnabled(self.history.can_redo())
+
+    def recordEdit(self, path, value):
+        self.history.record(path, value)
+        self.updateHistoryActions()
+
+    def commitModel(self, model):
+        self.model = model
+        self.history.commit(model)
+        self.updateHistoryActions()
+        self.widget.updateState()
+
+    def applyHistory(self, patch):
+        if patch is None:
+            return
+        patch.apply(self.model)
+        self.widget.updateFields(patch.paths())
+        self.updateHistoryActions()
+
+    def undo(self):
+        self.applyHistory(self.history.undo())
+
+    def redo(self):
+        self.applyHistory(self.history.redo())
         
     def saveFile(self):
         launchSaveFileDialog(self)
@@ -145,16 +249,71 @@ class AlesisVSysexApplication (QMainWindow):
         
     def loadFileCallback(self, name):
         f = FileDevice(name)
-        self.model = f.get_config()
-        self.widget.updateState()
+        self.commitModel(f.get_config())
         self.statusBar().showMessage("Loaded configuration from '%s'." % name)
     
+    def runDevice(self, message, loading, callback, fn, *args, **kwargs):
+        self.worker = DeviceWorker(fn, *args, timeout=DEVICE_TIMEOUT, **kwargs)
+        self.deviceCallback = callback
+        self.worker.signals.finished.connect(self.deviceResult)
+        self.worker.signals.failed.connect(self.deviceFailed)
+        self.worker.signals.done.connect(self.deviceDone)
+        self.widget.setDeviceBusy(True, loading)
+        self.progress.show()
+        self.cancelButton.show()
+        self.statusBar().showMessage(message)
+        self.threadPool.start(self.worker)
+
+    def isCurrentWorker(self):
+        # Signals are queued from the pool thread, so a cancel can land
+        # between the worker's own check and the emit. Results are only
+        # applied if they come from the live, uncancelled worker.
+        return (self.worker is not None and not self.worker.cancelled
+                and self.sender() is self.worker.signals)
+
+    def deviceResult(self, result):
+        if self.isCurrentWorker():
+            self.deviceCallback(result)
+
+    def deviceFinished(self):
+        self.widget.setDeviceBusy(True, False)
+        self.progress.hide()
+        self.cancelButton.hide()
+
+    def deviceFailed(self, error):
+        if not self.isCurrentWorker():
+            return
+        self.deviceFinished()
+        self.statusBar().showMessage("MIDI device error: %s" % error)
+
+    def deviceDone(self):
+        # The worker thread has released the device
+        if self.worker is None or self.sender() is not self.worker.signals:
+            return
+        self.worker = None
+        self.deviceFinished()
+        self.widget.setDeviceBusy(False)
+
+    def cancelDevice(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            self.deviceFinished()
+            self.statusBar().showMessage("Cancelled.")
+
     def saveDevice(self):
-        self.device.set_config(self.model)
+        self.runDevice("Saving configuration to MIDI device...", False,
+                       self.saveDeviceCallback, self.device.set_config,
+                       self.model.copy(), check=True)
+
+    def saveDeviceCallback(self, result):
+        self.deviceFinished()
         self.statusBar().showMessage("Saved configuration to MIDI device.")
-    
+
     def loadDevice(self):
-        self.model = self.device.get_config()
-        self.widget.updateState()
-        self.statusBar().showMessage("Loaded configuration from MIDI device.")
+        self.runDevice("Loading configuration from MIDI device...", True,
+                       self.loadDeviceCallback, self.device.get_config)
 
+    def loadDeviceCallback(self, model):
+        self.deviceFinished()
+        self.commitModel(model)
+        self.statusBar().showMessage("Loaded configuration from MIDI device.")
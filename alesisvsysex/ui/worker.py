@@ -0,0 +1,43 @@
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal, pyqtSlot
+
+__all__ = ['DeviceWorker']
+
+class WorkerSignals (QObject):
+
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    done = pyqtSignal()
+
+class DeviceWorker (QRunnable):
+
+    # Runs one device operation on a QThreadPool thread. `finished` or
+    # `failed` is emitted unless the operation was cancelled; `done` is always
+    # emitted last, once the thread no longer uses the device. Cancelling
+    # cannot interrupt a blocking device call, so `fn` is always given a
+    # finite `timeout` and the thread is released when it expires.
+
+    def __init__(self, fn, *args, timeout=5.0, **kwargs):
+        super().__init__()
+        if timeout is None or timeout <= 0:
+            raise ValueError("Device workers need a positive timeout")
+        self.fn = fn
+        self.args = args
+        self.kwargs = dict(kwargs, timeout=timeout)
+        self.cancelled = False
+        self.signals = WorkerSignals()
+
+    def cancel(self):
+        self.cancelled = True
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            if not self.cancelled:
+                self.signals.failed.emit(str(e) or e.__class__.__name__)
+        else:
+            if not self.cancelled:
+                self.signals.finished.emit(result)
+        finally:
+            self.signals.done.emit()
@@ -0,0 +1,60 @@
+import argparse
+import json
+import os
+import sys
+
+from benchmarks.suite import run
+
+# Run from the repository root with `python3 -m benchmarks`. Timings are
+# only comparable on the machine that recorded the baseline; run with --save
+# first on a new machine.
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+def compare(results, baseline, threshold):
+    failed = []
+    for name, t in sorted(results.items()):
+        if name not in baseline:
+            continue
+        ratio = t / baseline[name]
+        status = 'ok'
+        if ratio > 1 + threshold:
+            status = 'REGRESSION'
+            failed.append(name)
+        print("%-24s %6.2fx baseline  %s" % (name, ratio, status))
+    return failed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python3 -m benchmarks')
+    parser.add_argument('names', nargs='*', help="only run benchmarks with these prefixes")
+    parser.add_argument('--baseline', metavar='FILE', default=DEFAULT_BASELINE,
+                        help="baseline file (default: benchmarks/baseline.json)")
+    parser.add_argument('--save', action='store_true',
+                        help="store the results as the baseline")
+    parser.add_argument('--compare', action='store_true',
+                        help="fail if any result is slower than the baseline "
+                             "(recorded on the same machine)")
+    parser.add_argument('--threshold', type=float, default=1.0,
+                        help="allowed slowdown before failing (default: 1.0, i.e. 2x)")
+    parser.add_argument('--repeat', type=int, default=7,
+                        help="timings per benchmark; the median is reported (default: 7)")
+    args = parser.parse_args(argv)
+
+    results = run(args.names, repeat=args.repeat)
+
+    if args.save:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write('\n')
+
+    if args.compare:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        failed = compare(results, baseline, args.threshold)
+        if failed:
+            print("Regressions: %s" % ', '.join(failed))
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+import subprocess
+import sys
+
+# Run from the repository root with `python3 -m benchmarks.imports`.
+
+TARGETS = [
+    'alesisvsysex',
+    'alesisvsysex.protocol.model',
+    'alesisvsysex.protocol.sysex',
+    'alesisvsysex.device.file',
+    'alesisvsysex.cli',
+    'alesisvsysex.device.alesis',
+    'alesisvsysex.ui.window',
+]
+
+HEAVY = ['mido', 'rtmidi', 'PyQt5', 'numpy']
+
+_PROBE = ("import sys, time; t = time.perf_counter(); import %s; "
+          "t = time.perf_counter() - t; "
+          "print(t, ' '.join(m for m in %r if m in sys.modules))")
+
+def measure(target, repeat=5):
+    best = None
+    for _ in range(repeat):
+        out = subprocess.check_output([sys.executable, '-c', _PROBE % (target, HEAVY)])
+        t, _, loaded = out.decode().strip().partition(' ')
+        t = float(t)
+        best = t if best is None else min(best, t)
+    return best, loaded.split()
+
+def bench_startup(target):
+    def setup(models):
+        cmd = [sys.executable, '-c', 'import %s' % target]
+        return lambda: subprocess.check_call(cmd)
+    return setup
+
+def main():
+    for target in TARGETS:
+        try:
+            t, loaded = measure(target)
+        except subprocess.CalledProcessError:
+            print("%-32s failed to import" % target)
+            continue
+        print("%-32s %8.2f ms  loads: %s" % (target, t * 1e3, ', '.join(loaded) or '-'))
+
+if __name__ == "__main__":
+    main()
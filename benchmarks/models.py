@@ -0,0 +1,27 @@
+import random
+
+from alesisvsysex.protocol.codec import StructCodec
+from alesisvsysex.protocol.model import AlesisV
+from alesisvsysex.protocol.types import AbstractEnumValue
+from alesisvsysex.protocol.validate import Validator
+
+__all__ = ['random_model', 'random_models']
+
+def random_model(rng=random):
+    codec = StructCodec.for_class(AlesisV)
+    values = []
+    for path, cls in zip(codec.paths, codec.types):
+        if issubclass(cls, AbstractEnumValue):
+            values.append(rng.choice(sorted(cls._VALUES.values())))
+        elif path.endswith('.channel'):
+            values.append(rng.randrange(0x10))
+        else:
+            values.append(rng.randrange(0x80))
+    for lo, hi in Validator.for_class(AlesisV).pairs:
+        if values[lo] > values[hi]:
+            values[lo], values[hi] = values[hi], values[lo]
+    return AlesisV.deserialize(bytes(values))
+
+def random_models(count, seed=0):
+    rng = random.Random(seed)
+    return [random_model(rng) for _ in range(count)]
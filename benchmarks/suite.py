@@ -0,0 +1,88 @@
+import os
+import statistics
+import timeit
+
+from alesisvsysex.device.alesis import AlesisV25Device
+from alesisvsysex.device.emulator import EmulatedV25Port
+from alesisvsysex.protocol.model import AlesisV
+from alesisvsysex.protocol.sysex import SysexMessage
+from alesisvsysex.protocol.types import PadModeEnum
+from benchmarks.imports import bench_startup
+from benchmarks.models import random_models
+
+__all__ = ['BENCHMARKS', 'run']
+
+# Each benchmark takes a list of random models and returns a callable that
+# performs one operation.
+
+def bench_enum_lookup(models):
+    return lambda: PadModeEnum(0x02)
+
+def bench_serialize(models):
+    m = models[0]
+    return m.serialize
+
+def bench_deserialize(models):
+    b = models[0].serialize()
+    return lambda: AlesisV.deserialize(b)
+
+def bench_copy(models):
+    return models[0].copy
+
+def bench_sysex_roundtrip(models):
+    m = models[0]
+    return lambda: SysexMessage.deserialize(SysexMessage('reply', m).serialize())
+
+def bench_device_set_config(models):
+    d = AlesisV25Device(EmulatedV25Port())
+    m = models[0]
+    return lambda: d.set_config(m)
+
+def bench_ui_update_state(models):
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtWidgets import QApplication, QMainWindow
+    from alesisvsysex.ui.window import MainWidget
+
+    app = QApplication.instance() or QApplication([])
+    host = QMainWindow()
+    host.model = models[0]
+    widget = MainWidget(host)
+    state = {'i': 0, 'keep': (app, host, widget)}
+
+    def update():
+        state['i'] = (state['i'] + 1) % len(models)
+        host.model = models[state['i']]
+        widget.updateState()
+    return update
+
+BENCHMARKS = [
+    ('types.enum_lookup', bench_enum_lookup),
+    ('protocol.serialize', bench_serialize),
+    ('protocol.deserialize', bench_deserialize),
+    ('protocol.copy', bench_copy),
+    ('sysex.roundtrip', bench_sysex_roundtrip),
+    ('device.set_config', bench_device_set_config),
+    ('ui.update_state', bench_ui_update_state),
+    ('startup.protocol', bench_startup('alesisvsysex.protocol.model')),
+    ('startup.cli', bench_startup('alesisvsysex.cli')),
+]
+
+def run(names=None, number=None, repeat=7, seed=0):
+    # Reports the median of `repeat` timings per benchmark, which is less
+    # sensitive to one slow or fast sample than the minimum
+    models = random_models(16, seed)
+    results = {}
+    for name, setup in BENCHMARKS:
+        if names and not any(name.startswith(n) for n in names):
+            continue
+        try:
+            fn = setup(models)
+        except ImportError as e:
+            print("%-24s skipped (%s)" % (name, e))
+            continue
+        timer = timeit.Timer(fn)
+        n = number or timer.autorange()[0]
+        t = statistics.median(timer.repeat(repeat=repeat, number=n)) / n
+        results[name] = t
+        print("%-24s %10.2f us" % (name, t * 1e6))
+    return results
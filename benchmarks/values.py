@@ -0,0 +1,43 @@
+import gc
+import timeit
+import tracemalloc
+
+from alesisvsysex.protocol.model import AlesisV
+from alesisvsysex.protocol.types import *
+
+# Run from the repository root with `python3 -m benchmarks.values`.
+
+def bench_decode_time(number=10000):
+    b = AlesisV().serialize()
+    t = timeit.timeit(lambda: AlesisV.deserialize(b), number=number)
+    return t / number
+
+def bench_decode_memory(count=1000):
+    b = AlesisV().serialize()
+    AlesisV.deserialize(b)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    models = [AlesisV.deserialize(b) for _ in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, 'filename')
+    blocks = sum(s.count_diff for s in stats)
+    size = sum(s.size_diff for s in stats)
+    del models
+    return blocks / count, size / count
+
+def bench_enum_lookup(number=100000):
+    t = timeit.timeit(lambda: PadModeEnum(0x02), number=number)
+    return t / number
+
+def main():
+    t = bench_decode_time()
+    blocks, size = bench_decode_memory()
+    e = bench_enum_lookup()
+    print("decode:        %8.2f us/preset" % (t * 1e6))
+    print("decode memory: %8.1f blocks/preset, %8.0f bytes/preset" % (blocks, size))
+    print("enum lookup:   %8.3f us/value" % (e * 1e6))
+
+if __name__ == "__main__":
+    main()
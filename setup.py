@@ -4,7 +4,8 @@ setup(
     name="alesisvsysex",
     version="0.0.1",
     install_requires=["pytest", "python-rtmidi", "mido", "vext.pyqt5"],
-    packages=find_packages(),
+    extras_require={"numpy": ["numpy"]},
+    packages=find_packages(exclude=['benchmarks', 'benchmarks.*']),
     entry_points={
         'console_scripts': ['alesisvsysex=alesisvsysex.__main__:main'],
     }